@@ -0,0 +1,92 @@
+"""partition jwt_tokens by expires_at
+
+Revision ID: c7d41e9a2b6f
+Revises: b0fdbdd8e5c7
+Create Date: 2026-10-17 10:12:43.518204
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d41e9a2b6f'
+down_revision: Union[str, Sequence[str], None] = 'b0fdbdd8e5c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 2
+COLUMNS = "id, token, user_id, created, last_used, device_name, on_creation_ip, expires_at, is_revoked"
+
+
+def month_start(value: date, offset: int = 0) -> date:
+    month = value.year * 12 + value.month - 1 + offset
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def jwt_tokens_columns() -> list[sa.Column]:
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('token', sa.Text(), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE')),
+        sa.Column('created', sa.DateTime(timezone=True)),
+        sa.Column('last_used', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('device_name', sa.String(100), nullable=False),
+        sa.Column('on_creation_ip', sa.String(45), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('is_revoked', sa.Boolean(), default=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table('jwt_tokens', 'jwt_tokens_legacy')
+    op.execute("ALTER TABLE jwt_tokens_legacy RENAME CONSTRAINT jwt_tokens_pkey TO jwt_tokens_legacy_pkey")
+
+    op.create_table(
+        'jwt_tokens',
+        *jwt_tokens_columns(),
+        sa.PrimaryKeyConstraint('id', 'expires_at', name='jwt_tokens_pkey'),
+        postgresql_partition_by='RANGE (expires_at)'
+    )
+    op.create_index('ix_jwt_tokens_id', 'jwt_tokens', ['id'])
+    op.create_index('ix_jwt_tokens_user_id', 'jwt_tokens', ['user_id'])
+
+    oldest = op.get_bind().scalar(sa.text("SELECT min(expires_at) FROM jwt_tokens_legacy"))
+    today = datetime.now(timezone.utc).date()
+    start = month_start(min(oldest.date(), today) if oldest else today)
+    end = month_start(today, MONTHS_AHEAD + 1)
+
+    while start < end:
+        next_month = month_start(start, 1)
+        op.execute(
+            f"CREATE TABLE jwt_tokens_p{start:%Y%m} PARTITION OF jwt_tokens "
+            f"FOR VALUES FROM ('{start.isoformat()} 00:00:00+00') TO ('{next_month.isoformat()} 00:00:00+00')"
+        )
+        start = next_month
+
+    op.execute("CREATE TABLE jwt_tokens_default PARTITION OF jwt_tokens DEFAULT")
+
+    op.execute(f"INSERT INTO jwt_tokens ({COLUMNS}) SELECT {COLUMNS} FROM jwt_tokens_legacy")
+    op.drop_table('jwt_tokens_legacy')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('jwt_tokens', 'jwt_tokens_partitioned')
+    op.execute("ALTER TABLE jwt_tokens_partitioned RENAME CONSTRAINT jwt_tokens_pkey TO jwt_tokens_partitioned_pkey")
+    op.drop_index('ix_jwt_tokens_id', table_name='jwt_tokens_partitioned')
+    op.drop_index('ix_jwt_tokens_user_id', table_name='jwt_tokens_partitioned')
+
+    op.create_table(
+        'jwt_tokens',
+        *jwt_tokens_columns(),
+        sa.PrimaryKeyConstraint('id', name='jwt_tokens_pkey')
+    )
+
+    op.execute(f"INSERT INTO jwt_tokens ({COLUMNS}) SELECT {COLUMNS} FROM jwt_tokens_partitioned")
+    op.drop_table('jwt_tokens_partitioned')
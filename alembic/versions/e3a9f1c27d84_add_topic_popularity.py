@@ -0,0 +1,36 @@
+"""add topic popularity
+
+Revision ID: e3a9f1c27d84
+Revises: c7d41e9a2b6f
+Create Date: 2026-10-17 14:02:51.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9f1c27d84'
+down_revision: Union[str, Sequence[str], None] = 'c7d41e9a2b6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('topic_popularity',
+    sa.Column('topic_id', sa.Integer(), nullable=False),
+    sa.Column('hits', sa.BigInteger(), nullable=False),
+    sa.Column('last_hit', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['topic_id'], ['topic.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('topic_id')
+    )
+    op.create_index(op.f('ix_topic_popularity_hits'), 'topic_popularity', ['hits'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_topic_popularity_hits'), table_name='topic_popularity')
+    op.drop_table('topic_popularity')
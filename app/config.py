@@ -1,4 +1,5 @@
 import uuid
+from typing import Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -19,11 +20,30 @@ class Config(BaseSettings):
 	SECRET_KEY: str
 	ALGORITHM: str = "HS256"
 	ACCESS_TOKEN_EXPIRE_MINUTES: int = 10
+	ACCESS_TOKEN_CACHE_SIZE: int = 4096
 	REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+	JWT_LAST_USED_FLUSH_INTERVAL: int = 60 # seconds
+	JWT_PRUNE_BATCH_SIZE: int = 1000
+	JWT_PRUNE_MAX_BATCHES: int = 100
+	JWT_PARTITION_MONTHS_AHEAD: int = 2
 
 	# Password policy
 	PASSWORD_STRENGTH_POLICY: int = 2
 	PASSWORD_MIN_LENGTH: int = 8
+	PASSWORD_HASH_WORKERS: int = 2
+	PASSWORD_HASH_QUEUE_SIZE: int = 32
+	BCRYPT_ROUNDS: Optional[int] = None # calibrated at startup when unset
+	BCRYPT_MIN_ROUNDS: int = 10
+	BCRYPT_MAX_ROUNDS: int = 14
+	BCRYPT_LATENCY_BUDGET_MS: int = 250
+
+	# Login rate limiting
+	LOGIN_RATE_LIMIT_PER_IP: int = 20
+	LOGIN_RATE_LIMIT_PER_USERNAME: int = 5
+	LOGIN_RATE_LIMIT_WINDOW: int = 60 # seconds
+	LOGIN_LOCKOUT_THRESHOLD: int = 10 # failed attempts
+	LOGIN_LOCKOUT_WINDOW: int = 60 * 15 # seconds
+	LOGIN_LOCKOUT_DURATION: int = 60 * 15 # seconds
 
 	# Media
 	STATIC_MEDIA_FOLDER: str
@@ -48,6 +68,40 @@ class Config(BaseSettings):
 	REDIS_PORT: int
 	REDIS_DB:   int
 	CACHE_THRESHOLD: int = 1 # requests
+	CACHE_ADMISSION_POLICY: str = "tinylfu" # tinylfu | always
+	CACHE_SKETCH_WIDTH: int = 16384
+	CACHE_SKETCH_DEPTH: int = 4
+	CACHE_SKETCH_SAMPLE_SIZE: int = 163840 # reads between counter decays
+	CACHE_TTL_TOPIC: int = 60 * 60 # seconds
+	CACHE_TTL_TAG: int = 60 * 60 # seconds
+	CACHE_TTL_CATEGORY: int = 60 * 60 * 6 # seconds
+	CACHE_TTL_TOPIC_TRANSLATION: int = 60 * 30 # seconds
+	CACHE_TTL_TRANSLATION: int = 60 * 60 * 24 # seconds
+	CACHE_NEGATIVE_TTL: int = 30 # seconds a not-found id is remembered
+	CACHE_TTL_JITTER: float = 0.1 # up to +10% of the ttl
+	CACHE_STATS_SAMPLE_SIZE: int = 200 # keys probed with MEMORY USAGE
+	CACHE_PURGE_BATCH_SIZE: int = 500 # keys per SCAN step and UNLINK
+	CACHE_PURGE_JOB_TTL: int = 60 * 60 * 24 # seconds purge progress is kept
+	CACHE_L1_ENABLED: bool = False
+	CACHE_L1_SIZE: int = 1024 # entries per entity type
+	CACHE_L1_TTL: int = 30 # seconds, bounds staleness if an invalidation is lost
+	CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+	CACHE_INVALIDATION_RETRY_DELAY: int = 1 # seconds
+	CACHE_CLIENT_TRACKING: bool = False # keep translation and category keys locally, Redis pushes invalidations
+	CACHE_CLIENT_TRACKING_MAX_ENTRIES: int = 10000
+	CACHE_CLIENT_TRACKING_MAX_VALUE_BYTES: int = 16384 # larger values are always read from Redis
+	CACHE_CLIENT_TRACKING_TTL: int = 300 # seconds
+	CACHE_BREAKER_FAILURE_THRESHOLD: int = 5 # consecutive failed calls before Redis is skipped
+	CACHE_BREAKER_COOL_DOWN: float = 10 # seconds reads go straight to the database
+	CACHE_BREAKER_CALL_TIMEOUT: float = 0.25 # seconds per cache call
+	CACHE_BREAKER_PROBE_INTERVAL: float = 1 # seconds
+	SINGLE_FLIGHT_LOCK_TTL: float = 5 # seconds
+	SINGLE_FLIGHT_WAIT_TIMEOUT: float = 2 # seconds before loading without the lock
+	SINGLE_FLIGHT_POLL_INTERVAL: float = 0.05 # seconds
+	CACHE_WARMUP_ON_STARTUP: bool = True
+	CACHE_WARMUP_TOPICS: int = 500 # most popular topics loaded by the warm-up
+	TOPIC_POPULARITY_FLUSH_INTERVAL: int = 60 # seconds
+	PRINCIPAL_CACHE_TTL: int = 30 # seconds
 
 
 class SystemAP():
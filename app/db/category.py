@@ -1,7 +1,7 @@
 from sqlalchemy import delete, exists, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..redis.cache import category_cache
+from ..redis.cache import category_cache, topic_cache, topic_translation_cache
 from ..schema.category import CategoryCreateRequst, CategoryUpdateRequst
 from . import schema
 
@@ -60,6 +60,7 @@ async def update_category(db: AsyncSession, category_id: int, category: Category
 		.values(**kw)
 	)
 	await db.commit()
+	await category_cache.invalidate(category_id)
 
 	return result.rowcount > 0
 
@@ -69,4 +70,7 @@ async def delete_by_id(db: AsyncSession, category_id: int) -> None:
 		.where(schema.Category.id == category_id)
 	)
 	await db.commit()
-	await category_cache.delete(category_id)
+	await category_cache.invalidate(category_id)
+	# Topics of the category and their translations are removed by ON DELETE CASCADE
+	await topic_cache.invalidate_all()
+	await topic_translation_cache.invalidate_all()
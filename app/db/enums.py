@@ -81,3 +81,4 @@ class EntityType(str, Enum):
 	category = "category"
 	topic_translation = "topic-translation"
 	translation = "translation"
+	media = "media"
@@ -1,14 +1,47 @@
 import uuid
+from typing import Optional
 
 import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Select, bindparam, delete, or_, select, text, update
 
 from . import schema
+from .pagination import keyset_page
+from ..redis.revocation import revocation_registry
 
-async def get_jwt_tokens_list(db: AsyncSession) -> list[schema.JWT_Token]:
-	res = await db.execute(select(schema.JWT_Token))
-	return res.scalars().all()
+# Pending "last_used" bumps of refresh tokens, flushed in bulk by flush_last_used
+last_used_buffer: dict[uuid.UUID, datetime.datetime] = {}
+
+def jwt_tokens_list_query(user_id: Optional[uuid.UUID] = None,
+						  is_revoked: Optional[bool] = None,
+						  expires_after: Optional[datetime.datetime] = None,
+						  expires_before: Optional[datetime.datetime] = None) -> Select:
+	stmt = select(schema.JWT_Token)
+
+	if user_id is not None:
+		stmt = stmt.where(schema.JWT_Token.user_id == user_id)
+
+	if is_revoked is not None:
+		stmt = stmt.where(schema.JWT_Token.is_revoked == is_revoked)
+
+	if expires_after is not None:
+		stmt = stmt.where(schema.JWT_Token.expires_at >= expires_after)
+
+	if expires_before is not None:
+		stmt = stmt.where(schema.JWT_Token.expires_at < expires_before)
+
+	return stmt
+
+
+async def get_jwt_tokens_list(db: AsyncSession,
+							  cursor: Optional[uuid.UUID] = None,
+							  limit: int = 50,
+							  user_id: Optional[uuid.UUID] = None,
+							  is_revoked: Optional[bool] = None,
+							  expires_after: Optional[datetime.datetime] = None,
+							  expires_before: Optional[datetime.datetime] = None) -> tuple[list[schema.JWT_Token], Optional[uuid.UUID]]:
+	stmt = jwt_tokens_list_query(user_id, is_revoked, expires_after, expires_before)
+	return await keyset_page(db, stmt, schema.JWT_Token.id, cursor, limit)
 
 
 async def get_jwt_token_by_id(db: AsyncSession, token_id: str) -> schema.JWT_Token | None:
@@ -22,34 +55,67 @@ async def get_jwt_token_by_user_id(db: AsyncSession, user_id: uuid.UUID) -> list
 	return res.scalars().all()
 
 
-async def check_jwt_token(db: AsyncSession, token: str) -> bool:
-	res = await db.execute(select(schema.JWT_Token).where(schema.JWT_Token.token == token,
-													      schema.JWT_Token.is_revoked == False))
-	token: schema.JWT_Token = res.scalars().first()
+async def check_jwt_token(db: AsyncSession, jti: str | None, token: str) -> bool:
+	try:
+		token_id = uuid.UUID(jti)
+	except (TypeError, ValueError):
+		return False
 
-	if not token:
+	if await revocation_registry.is_revoked(token_id):
 		return False
-	
-	if token.expires_at.replace(tzinfo=datetime.timezone.utc) < \
-								datetime.datetime.now(datetime.timezone.utc):
-		token.is_revoked = True
-		db.add(token)
-		await db.commit()
+
+	jwt_token = await db.scalar(select(schema.JWT_Token).where(schema.JWT_Token.id == token_id))
+
+	if not jwt_token or jwt_token.is_revoked or jwt_token.token != token:
 		return False
-	
-	token.last_used = datetime.datetime.now(datetime.timezone.utc)
-	db.add(token)
-	await db.commit()
-	
+
+	now = datetime.datetime.now(datetime.timezone.utc)
+
+	if jwt_token.expires_at.replace(tzinfo=datetime.timezone.utc) < now:
+		return False
+
+	last_used_buffer[token_id] = now
 	return True
 
 
+async def flush_last_used(db: AsyncSession) -> int:
+	if not last_used_buffer:
+		return 0
+
+	pending = dict(last_used_buffer)
+	last_used_buffer.clear()
+
+	# Core executemany: rows pruned or cascaded away since the bump are skipped, not a StaleDataError
+	table = schema.JWT_Token.__table__
+
+	try:
+		await db.execute(
+			update(table)
+			.where(table.c.id == bindparam("b_id"))
+			.values(last_used = bindparam("b_last_used")),
+			[{"b_id": token_id, "b_last_used": last_used} for token_id, last_used in pending.items()]
+		)
+		await db.commit()
+	except Exception:
+		await db.rollback()
+
+		for token_id, last_used in pending.items():
+			last_used_buffer.setdefault(token_id, last_used)
+
+		raise
+
+	return len(pending)
+
+
 async def register_jwt_token(db: AsyncSession, token: schema.JWT_Token):
 	db.add(token)
 	await db.commit()
 
 
 async def revoke_jwt_token(db: AsyncSession, token_id: int) -> bool:
+	if await revocation_registry.is_revoked(token_id):
+		return True
+
 	token = await get_jwt_token_by_id(db, token_id)
 
 	if not token:
@@ -58,4 +124,98 @@ async def revoke_jwt_token(db: AsyncSession, token_id: int) -> bool:
 	token.is_revoked = True
 	db.add(token)
 	await db.commit()
-	return True
\ No newline at end of file
+	await revocation_registry.revoke(token.id, token.expires_at)
+	return True
+
+
+async def rebuild_revocation_registry(db: AsyncSession) -> int:
+	res = await db.execute(
+		select(schema.JWT_Token.id, schema.JWT_Token.expires_at)
+		.where(
+			schema.JWT_Token.is_revoked == True,
+			schema.JWT_Token.expires_at > datetime.datetime.now(datetime.timezone.utc)
+		)
+	)
+
+	return await revocation_registry.revoke_many(res.tuples().all())
+
+
+async def prune_jwt_tokens(db: AsyncSession, batch_size: int, max_batches: int) -> int:
+	deleted = 0
+
+	for _ in range(max_batches):
+		batch = (
+			select(schema.JWT_Token.id)
+			.where(or_(
+				schema.JWT_Token.is_revoked == True,
+				schema.JWT_Token.expires_at < datetime.datetime.now(datetime.timezone.utc)
+			))
+			.limit(batch_size)
+		)
+
+		res = await db.execute(
+			delete(schema.JWT_Token)
+			.where(schema.JWT_Token.id.in_(batch))
+			.execution_options(synchronize_session=False)
+		)
+		await db.commit()
+
+		deleted += res.rowcount
+
+		if res.rowcount < batch_size:
+			break
+
+	return deleted
+
+
+def jwt_partition_name(month: datetime.date) -> str:
+	return f"jwt_tokens_p{month:%Y%m}"
+
+
+def _month_start(value: datetime.date, offset: int = 0) -> datetime.date:
+	month = value.year * 12 + value.month - 1 + offset
+	return datetime.date(month // 12, month % 12 + 1, 1)
+
+
+async def is_jwt_table_partitioned(db: AsyncSession) -> bool:
+	return bool(await db.scalar(text(
+		"SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+		"JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = 'jwt_tokens')"
+	)))
+
+
+async def maintain_jwt_partitions(db: AsyncSession, months_ahead: int) -> list[str]:
+	if not await is_jwt_table_partitioned(db):
+		return []
+
+	today = datetime.datetime.now(datetime.timezone.utc).date()
+	current_month = _month_start(today)
+
+	# A fresh database gets the table from create_all without any partition
+	await db.execute(text("CREATE TABLE IF NOT EXISTS jwt_tokens_default PARTITION OF jwt_tokens DEFAULT"))
+
+	for offset in range(months_ahead + 1):
+		start = _month_start(today, offset)
+		end = _month_start(today, offset + 1)
+
+		await db.execute(text(
+			f"CREATE TABLE IF NOT EXISTS {jwt_partition_name(start)} PARTITION OF jwt_tokens "
+			f"FOR VALUES FROM ('{start.isoformat()} 00:00:00+00') TO ('{end.isoformat()} 00:00:00+00')"
+		))
+
+	res = await db.execute(text(
+		"SELECT c.relname FROM pg_inherits i "
+		"JOIN pg_class c ON c.oid = i.inhrelid "
+		"JOIN pg_class p ON p.oid = i.inhparent "
+		"WHERE p.relname = 'jwt_tokens' AND c.relname LIKE 'jwt\\_tokens\\_p%'"
+	))
+
+	dropped: list[str] = []
+
+	for partition in res.scalars().all():
+		if partition < jwt_partition_name(current_month):
+			await db.execute(text(f"DROP TABLE IF EXISTS {partition}"))
+			dropped.append(partition)
+
+	await db.commit()
+	return dropped
\ No newline at end of file
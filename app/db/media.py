@@ -14,6 +14,7 @@ from ..utils import media as m
 from ..db.enums import MediaType, MediaSize
 from ..db.application_parameter import set_default_value
 from ..db.users import get_root_user
+from ..redis.cache import media_cache
 
 
 async def media_exist(db: AsyncSession, cover_image_id: int) -> int:
@@ -76,6 +77,7 @@ async def add_media(db: AsyncSession, user: schema.User, topic_id: int | None, f
 	db.add(media)
 	await db.commit()
 	await db.refresh(media)
+	await media_cache.invalidate(media.id)
 
 	return media
 
@@ -115,7 +117,24 @@ async def init_media(db: AsyncSession):
 
 async def get_media_by_id(db: AsyncSession, media_id: int, preload_all: bool = False) -> schema.MediaObject | None:
 	if not preload_all:
-		return await db.get(schema.MediaObject, media_id)
+		# Not through fetch: single-flight would hand this session's ORM object to other requests
+		admitted = media_cache.should_admit(media_id)
+		stamp = ""
+
+		if admitted:
+			lookup = await media_cache.lookup(media_id)
+
+			if lookup.missing:
+				return None
+
+			stamp = lookup.stamp
+
+		media = await db.get(schema.MediaObject, media_id)
+
+		if media is None and admitted:
+			await media_cache.set_missing(media_id, stamp)
+
+		return media
 
 	result = await db.scalar(
 		select(schema.MediaObject)
@@ -0,0 +1,38 @@
+import json
+from typing import Any, Optional
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+async def keyset_page(
+	db: AsyncSession,
+	stmt: Select,
+	key: InstrumentedAttribute,
+	cursor: Optional[Any],
+	limit: int
+) -> tuple[list[Any], Optional[Any]]:
+	if cursor is not None:
+		stmt = stmt.where(key > cursor)
+
+	result = await db.scalars(stmt.order_by(key).limit(limit + 1))
+	rows = result.all()
+
+	if len(rows) <= limit:
+		return list(rows), None
+
+	return list(rows[:limit]), getattr(rows[limit - 1], key.key)
+
+
+async def estimate_count(db: AsyncSession, stmt: Select) -> int:
+	conn = await db.connection()
+	query = stmt.compile(dialect = conn.dialect, compile_kwargs = {"literal_binds": True})
+
+	result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {query}")
+	plan = result.scalar()
+
+	if isinstance(plan, str):
+		plan = json.loads(plan)
+
+	return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,58 @@
+import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import schema
+
+topic_hits_buffer: dict[int, int] = {}
+
+
+def record_topic_hit(topic_id: int) -> None:
+	topic_hits_buffer[topic_id] = topic_hits_buffer.get(topic_id, 0) + 1
+
+
+async def flush_topic_hits(db: AsyncSession) -> int:
+	if not topic_hits_buffer:
+		return 0
+
+	pending = dict(topic_hits_buffer)
+	topic_hits_buffer.clear()
+	now = datetime.datetime.now(datetime.timezone.utc)
+
+	# Topics deleted since the hit was recorded would violate the foreign key
+	existing = set(await db.scalars(
+		select(schema.Topic.id).where(schema.Topic.id.in_(pending))
+	))
+
+	if not existing:
+		return 0
+
+	stmt = insert(schema.TopicPopularity).values([
+		{"topic_id": topic_id, "hits": hits, "last_hit": now}
+		for topic_id, hits in pending.items()
+		if topic_id in existing
+	])
+	await db.execute(
+		stmt.on_conflict_do_update(
+			index_elements = [schema.TopicPopularity.topic_id],
+			set_ = {
+				"hits": schema.TopicPopularity.hits + stmt.excluded.hits,
+				"last_hit": stmt.excluded.last_hit,
+			}
+		)
+	)
+	await db.commit()
+
+	return len(existing)
+
+
+async def get_top_topic_ids(db: AsyncSession, limit: int) -> list[int]:
+	result = await db.scalars(
+		select(schema.TopicPopularity.topic_id)
+		.order_by(schema.TopicPopularity.hits.desc())
+		.limit(limit)
+	)
+
+	return list(result.all())
@@ -4,7 +4,7 @@ from typing import Optional
 import uuid
 
 from sqlalchemy import (
-	String, Text, Enum as SqlEnum, ForeignKey, Boolean, DateTime, Integer
+	String, Text, Enum as SqlEnum, ForeignKey, Boolean, DateTime, Integer, BigInteger
 )
 from sqlalchemy.orm import (
 	Mapped, mapped_column, relationship, DeclarativeBase
@@ -45,15 +45,17 @@ class User(Base):
 
 class JWT_Token(Base):
 	__tablename__ = "jwt_tokens"
+	# Range partitioned by expiry month, so expires_at has to be part of the primary key
+	__table_args__ = {"postgresql_partition_by": "RANGE (expires_at)"}
 
-	id               : Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+	id               : Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, index=True)
 	token            : Mapped[str] = mapped_column(Text, nullable=False)
-	user_id          : Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+	user_id          : Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
 	created          : Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now(timezone.utc))
 	last_used        : Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 	device_name      : Mapped[str] = mapped_column(String(100), nullable=False)
 	on_creation_ip   : Mapped[str] = mapped_column(String(45), nullable=False)
-	expires_at       : Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+	expires_at       : Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
 	is_revoked       : Mapped[bool] = mapped_column(Boolean, default=False)
 
 	user: Mapped[User] = relationship(back_populates="tokens")
@@ -166,6 +168,14 @@ class TopicLink(Base):
 	topic: Mapped[Topic] = relationship(back_populates="links")
 
 
+class TopicPopularity(Base):
+	__tablename__ = "topic_popularity"
+
+	topic_id   : Mapped[int] = mapped_column(ForeignKey("topic.id", ondelete="CASCADE"), primary_key=True)
+	hits       : Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, index=True)
+	last_hit   : Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
 class Audit(Base):
 	__tablename__ = "audit"
 
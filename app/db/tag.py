@@ -2,7 +2,6 @@ from sqlalchemy import delete, exists, select, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..config import settings
 from ..db.enums import EntityType
 from ..redis.cache import topic_cache, tag_cache
 from ..schema.tag import TagCreateRequst, TagBase, EditTagRequst
@@ -23,6 +22,7 @@ async def create_tag(db: AsyncSession, tag: TagCreateRequst) -> int:
 	db.add(new_tag)
 	await db.commit()
 	await db.refresh(new_tag)
+	await tag_cache.invalidate(new_tag.id)
 
 	return new_tag.id
 
@@ -43,11 +43,11 @@ async def delete_tag(db: AsyncSession, tag_id: int) -> bool:
 		.where(schema.Tag.id == tag_id)
 		.returning(schema.Tag.id)
 	)
-	await tag_cache.delete(tag_id)
+	await tag_cache.invalidate(tag_id)
 	return result.scalar() is not None
 
 
-async def edit_tag(db: AsyncSession, tag_id: int, tag: TagBase, tag_req: EditTagRequst) -> None:
+async def edit_tag(db: AsyncSession, tag_id: int, tag_req: EditTagRequst) -> None:
 	values = {}
 	if tag_req.name is not None:
 		values["name"] = tag_req.name
@@ -65,14 +65,7 @@ async def edit_tag(db: AsyncSession, tag_id: int, tag: TagBase, tag_req: EditTag
 	)
 	await db.commit()
 
-	if await tag_cache.exist(tag_id):
-		if tag_req.name:
-			tag.name = tag_req.name
-
-		if tag_req.description:
-			tag.description = tag_req.description
-
-		await tag_cache.set(tag_id, tag)
+	await tag_cache.invalidate(tag_id)
 
 
 async def get_tags_list(db: AsyncSession, search: str) -> list[TagBase]:
@@ -88,47 +81,54 @@ async def get_all_tags_list(db: AsyncSession) -> list[TagBase]:
 	return [TagBase.model_validate(row) for row in result.all()]
 
 
-async def get_topics_list_by_tag(db: AsyncSession, tag_id: int) -> list[TopicBase]:
-	count = await tag_cache.incr(tag_id, EntityType.topic)
-	is_cached = count >= settings.CACHE_THRESHOLD
+async def get_topics_list_by_tag(db: AsyncSession, tag_id: int) -> list[TopicBase] | None:
+	is_cached = tag_cache.should_admit(tag_id, EntityType.topic)
+	stamp = ""
+	related_stamps: dict[int, str] = {}
 	if is_cached:
-		cached = await tag_cache.get_relations(tag_id, EntityType.topic)
-		if cached:
-			return cached
+		lookup = await tag_cache.lookup_relations(tag_id, EntityType.topic)
+		if lookup.missing:
+			return None
+		if lookup.value is not None:
+			return lookup.value
+
+		stamp = lookup.stamp
+
+		# Stamped before the rows are read, an edit in between then fails the stamp check
+		topic_ids = await db.scalars(
+			select(schema.TagInTopic.topic_id).where(schema.TagInTopic.tag_id == tag_id)
+		)
+		related_stamps = await topic_cache.stamp_map(list(topic_ids.all()))
 
 	result = await db.scalars(
 		select(schema.Topic)
 		.join(schema.TagInTopic, schema.Topic.id == schema.TagInTopic.topic_id)
 		.where(schema.TagInTopic.tag_id == tag_id)
+		.order_by(schema.Topic.id)
 	)
 
-	tag_topics: list[TopicBase] = []
-	for row in result.all():
-		obj = TopicBase.model_validate(row)
+	tag_topics = [TopicBase.model_validate(row) for row in result.all()]
+
+	# The tombstone lives in the relation key, so a repeated 404 is still one Redis call
+	if not tag_topics and not await db.scalar(select(exists().where(schema.Tag.id == tag_id))):
 		if is_cached:
-			await topic_cache.set(obj.id, obj)
-			await tag_cache.add_relation(tag_id, EntityType.topic, obj.id)
-			await topic_cache.add_back_relation(obj.id, EntityType.tag, tag_id)
-		tag_topics.append(obj)
+			await tag_cache.set_relations_missing(tag_id, EntityType.topic, stamp)
+		return None
+
+	if is_cached:
+		await tag_cache.set_relations(tag_id, EntityType.topic, tag_topics, stamp, related_stamps)
+
 	return tag_topics
 
 
 async def get_tag_by_id(db: AsyncSession, tag_id: int) -> TagBase | None:
-	count = await tag_cache.incr(tag_id)
-	#if count >= settings.CACHE_THRESHOLD:
-	cached = await tag_cache.get(tag_id)
-	if cached:
-		return cached
-
-	result = await db.get(schema.Tag, tag_id)
-	if result is None:
-		return None
-	tag = TagBase.model_validate(result)
-
-	if count >= settings.CACHE_THRESHOLD:
-		await tag_cache.set(tag_id, tag)
+	async def load() -> TagBase | None:
+		result = await db.get(schema.Tag, tag_id)
+		if result is None:
+			return None
+		return TagBase.model_validate(result)
 
-	return tag
+	return await tag_cache.fetch(tag_id, load)
 
 async def attach_tag_to_topic(db: AsyncSession, topic_id: int, tag_id: int) -> bool:
 	tag = await get_tag_by_id(db, tag_id)
@@ -143,12 +143,10 @@ async def attach_tag_to_topic(db: AsyncSession, topic_id: int, tag_id: int) -> b
 		)
 		.returning(schema.TagInTopic.tag_id)
 	)
-	if await topic_cache.exist(topic_id, EntityType.tag):
-		await tag_cache.set(tag_id, tag)
-		await topic_cache.add_relation(topic_id, EntityType.tag, tag_id)
-		await tag_cache.add_back_relation(tag_id, EntityType.topic, topic_id)
-
 	await db.commit()
+
+	await topic_cache.invalidate(topic_id)
+	await tag_cache.invalidate(tag_id)
 	return result.scalar() is not None
 
 
@@ -165,8 +163,8 @@ async def detach_tag_from_topic(db: AsyncSession, topic_id: int, tag_id: int) ->
 		)
 		.returning(schema.TagInTopic.tag_id)
 	)
-	await topic_cache.delete_relation(topic_id, EntityType.tag, tag_id)
-	await tag_cache.delete_back_relation(tag_id, EntityType.topic, topic_id)
-
 	await db.commit()
+
+	await topic_cache.invalidate(topic_id)
+	await tag_cache.invalidate(tag_id)
 	return result.scalar() is not None
@@ -53,7 +53,16 @@ async def change_task_state(db: AsyncSession, task_id: int, enable: bool) -> Non
 
 async def init_tasks(db: AsyncSession):
 	tasks_list = {
-		
+		"tasks.prune_jwt_tokens": {
+			"pretty_name": "Prune expired and revoked JWT tokens",
+			"interval": 60 * 60,
+			"enabled": True
+		},
+		"tasks.warm_cache": {
+			"pretty_name": "Warm Redis cache with the most popular topics",
+			"interval": 60 * 60 * 6,
+			"enabled": False
+		}
 	}
 
 	
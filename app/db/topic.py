@@ -6,20 +6,17 @@ from fastapi import HTTPException
 from sqlalchemy import delete, exists, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..config import settings
 from ..db.enums import EntityType
-from ..redis.cache import category_cache, topic_cache, topic_translation_cache, tag_cache
+from ..redis.cache import category_cache, tag_cache, topic_cache, topic_translation_cache, lookup_topic_category
 from ..schema import category, topics, tag
 from ..schema.topics import (
 	TopicCreateRequst,
-	TopicTranslationBase,
 	TopicTranslationCreated,
 	TranslationCreateRequst,
 	TranslationEditRequest,
 )
-from ..schema.translation_code import Translation
 from ..utils.security import hash_topic_name
-from . import schema
+from . import popularity, schema
 
 
 async def topic_exists_by_name(topic_name: str, db: AsyncSession) -> bool | None:
@@ -32,34 +29,27 @@ async def topic_exists_by_name(topic_name: str, db: AsyncSession) -> bool | None
 
 
 async def get_topic(topic_id: int, db: AsyncSession) -> topics.TopicBase | None:
-	count = await topic_cache.incr(topic_id)
-	if count >= settings.CACHE_THRESHOLD:
-		cached = await topic_cache.get(topic_id)
-		if cached is not None:
-			return cached
-
-	result = await db.get(schema.Topic, topic_id)
-	if result is None:
-		return None
-	topic = topics.TopicBase.model_validate(result)
+	popularity.record_topic_hit(topic_id)
 
-	if count >= settings.CACHE_THRESHOLD:
-		await topic_cache.set(topic_id, topic)
+	async def load() -> topics.TopicBase | None:
+		result = await db.get(schema.Topic, topic_id)
+		if result is None:
+			return None
+		return topics.TopicBase.model_validate(result)
 
-	return topic
+	return await topic_cache.fetch(topic_id, load)
 
 
 async def get_topic_category(topic_id: int, db: AsyncSession) -> category.CategoryBase | None:
-	count = await category_cache.incr(topic_id)
-
-	if count >= settings.CACHE_THRESHOLD:
-		topic_cached = await topic_cache.get(topic_id)
+	admitted = category_cache.should_admit(topic_id)
+	category_id = None
+	stamp = ""
 
-		if topic_cached is not None:
-			cached = await category_cache.get(topic_cached.category_id)
+	if admitted:
+		cached, category_id, stamp = await lookup_topic_category(topic_id)
 
-			if cached is not None:
-				return cached
+		if cached is not None:
+			return cached
 
 	result = await db.scalar(
 		select(schema.Category)
@@ -73,54 +63,58 @@ async def get_topic_category(topic_id: int, db: AsyncSession) -> category.Catego
 	
 	topic_category = category.CategoryBase.model_validate(result)
 
-	if count >= settings.CACHE_THRESHOLD:
-		await category_cache.set(topic_category.id, topic_category)
-		await category_cache.add_cascade(topic_category.id, EntityType.topic, topic_id)
+	# Only filled when the cached topic named this category, its stamp then predates the query
+	if admitted and topic_category.id == category_id:
+		await category_cache.set(topic_category.id, topic_category, stamp)
 
 	return topic_category
 
 
 async def get_topic_translations(topic_id: int, translation_id: int, db: AsyncSession) -> topics.TopicTranslationBase | None:
-	count = await topic_translation_cache.incr(translation_id)
-	topic_translation = await topic_translation_cache.get(translation_id)
-	if topic_translation:
-		return topic_translation
-
-	result = await db.execute(
-		select(
-			schema.TopicTranslation.id,
-			schema.TopicTranslation.topic_id,
-			schema.TopicTranslation.parse_mode,
-			schema.TopicTranslation.text,
-			schema.Translation.translation_code,
-			schema.Translation.full_name,
-		)
-		.join(
-			schema.Translation,
-			schema.Translation.id == schema.TopicTranslation.translation_id,
-		)
-		.where(
-			schema.TopicTranslation.topic_id == topic_id,
-			schema.TopicTranslation.id == translation_id
+	# Loaded by id alone so a cached not-found entry means the id does not exist at all
+	async def load() -> topics.TopicTranslationBase | None:
+		result = await db.execute(
+			select(
+				schema.TopicTranslation.id,
+				schema.TopicTranslation.topic_id,
+				schema.TopicTranslation.parse_mode,
+				schema.TopicTranslation.text,
+				schema.Translation.translation_code,
+				schema.Translation.full_name,
+			)
+			.join(
+				schema.Translation,
+				schema.Translation.id == schema.TopicTranslation.translation_id,
+			)
+			.where(schema.TopicTranslation.id == translation_id)
 		)
-	)
-	row = result.mappings().first()
-	if not row:
-		return None
-	obj = topics.TopicTranslationBase.model_validate(row)
+		row = result.mappings().first()
+		if not row:
+			return None
+		return topics.TopicTranslationBase.model_validate(row)
+
+	obj = await topic_translation_cache.fetch(translation_id, load)
 
-	if count >= settings.CACHE_THRESHOLD:
-		await topic_translation_cache.set(obj.id, obj)
-		await topic_cache.add_relation(topic_id, EntityType.topic_translation, obj.id)
+	if obj is None or obj.topic_id != topic_id:
+		return None
 	return obj
 
 async def get_topic_translations_list(topic_id: int, db: AsyncSession) -> list[topics.TopicTranslationBase]:
-	count = await topic_cache.incr(topic_id, EntityType.topic_translation)
-	is_cached = count >= settings.CACHE_THRESHOLD
+	is_cached = topic_cache.should_admit(topic_id, EntityType.topic_translation)
+	stamp = ""
+	related_stamps: dict[int, str] = {}
 	if is_cached:
-		caches = await topic_cache.get_relations(topic_id, EntityType.topic_translation)
-		if caches:
-			return caches
+		lookup = await topic_cache.lookup_relations(topic_id, EntityType.topic_translation)
+		if lookup.value is not None:
+			return lookup.value
+
+		stamp = lookup.stamp
+
+		# Stamped before the rows are read, an edit in between then fails the stamp check
+		translation_ids = await db.scalars(
+			select(schema.TopicTranslation.id).where(schema.TopicTranslation.topic_id == topic_id)
+		)
+		related_stamps = await topic_translation_cache.stamp_map(list(translation_ids.all()))
 
 	result = await db.execute(
 		select(
@@ -136,42 +130,44 @@ async def get_topic_translations_list(topic_id: int, db: AsyncSession) -> list[t
 			schema.Translation.id == schema.TopicTranslation.translation_id,
 		)
 		.where(schema.TopicTranslation.topic_id == topic_id)
+		.order_by(schema.TopicTranslation.id)
 	)
 	rows = result.mappings().all()
 
-	topic_translations: list[topics.TopicTranslationBase] = []
-	for row in rows:
-		obj = topics.TopicTranslationBase.model_validate(row)
-		if is_cached:
-			await topic_translation_cache.set(obj.id, obj)
-			await topic_cache.add_relation(topic_id, EntityType.topic_translation, obj.id)
-			await topic_translation_cache.add_back_relation(obj.id, EntityType.topic, topic_id)
-		topic_translations.append(obj)
+	topic_translations = [topics.TopicTranslationBase.model_validate(row) for row in rows]
+
+	if is_cached:
+		await topic_cache.set_relations(topic_id, EntityType.topic_translation, topic_translations, stamp, related_stamps)
+
 	return topic_translations
 
 
 async def get_list_topic_tags(topic_id: int, db: AsyncSession) -> list[tag.TagBase]:
-	count = await topic_cache.incr(topic_id, EntityType.tag)
-	is_cache = count >= settings.CACHE_THRESHOLD
+	is_cache = topic_cache.should_admit(topic_id, EntityType.tag)
+	stamp = ""
+	related_stamps: dict[int, str] = {}
 	if is_cache:
-		cache = await topic_cache.get_relations(topic_id, EntityType.tag)
-		if cache:
-			return cache
+		lookup = await topic_cache.lookup_relations(topic_id, EntityType.tag)
+		if lookup.value is not None:
+			return lookup.value
+
+		stamp = lookup.stamp
+
+		tag_ids = await db.scalars(
+			select(schema.TagInTopic.tag_id).where(schema.TagInTopic.topic_id == topic_id)
+		)
+		related_stamps = await tag_cache.stamp_map(list(tag_ids.all()))
 	
 	result = await db.scalars(
 		select(schema.Tag)
 		.join(schema.TagInTopic, schema.TagInTopic.tag_id == schema.Tag.id)
 		.where(schema.TagInTopic.topic_id == topic_id)
-		.order_by(schema.Tag.name)
+		.order_by(schema.Tag.name, schema.Tag.id)
 	)
-	tags: list[tag.TagBase] = []
-	for row in result.all():
-		obj = tag.TagBase.model_validate(row)
-		if is_cache:
-			await tag_cache.set(obj.id, obj)
-			await topic_cache.add_relation(topic_id, EntityType.tag, obj.id)
-			await tag_cache.add_back_relation(obj.id, EntityType.topic, topic_id)
-		tags.append(obj)
+	tags = [tag.TagBase.model_validate(row) for row in result.all()]
+
+	if is_cache:
+		await topic_cache.set_relations(topic_id, EntityType.tag, tags, stamp, related_stamps)
 
 	return tags
 
@@ -195,6 +191,7 @@ async def create_topic(
 
 	await db.commit()
 	await db.refresh(new_topic)
+	await topic_cache.invalidate(new_topic.id)
 
 	return new_topic.id
 
@@ -203,8 +200,7 @@ async def add_translation(
 	db: AsyncSession,
 	topic_id: int,
 	user_id: uuid.UUID,
-	translation: TranslationCreateRequst,
-	translation_code: Translation
+	translation: TranslationCreateRequst
 ) -> TopicTranslationCreated:
 	new_translation = schema.TopicTranslation(
 		translation_id    = translation.translation_code_id,
@@ -222,17 +218,8 @@ async def add_translation(
 	await db.commit()
 	await db.refresh(new_translation)
 
-	if await topic_cache.exist(topic_id):
-		topic_translation = TopicTranslationBase(
-			id=new_translation.id,
-			topic_id=topic_id,
-			parse_mode=new_translation.parse_mode,
-			text=new_translation.text,
-			translation_code=translation_code.translation_code,
-			full_name=translation_code.full_name,
-		)
-		await topic_translation_cache.set(new_translation.id, topic_translation)
-		await topic_cache.add_relation(topic_id, EntityType.topic_translation, new_translation.id)
+	await topic_cache.invalidate(topic_id)
+	await topic_translation_cache.invalidate(new_translation.id)
 
 	return topics.TopicTranslationCreated.model_validate(new_translation)
 
@@ -242,8 +229,7 @@ async def add_translation(
 	db: AsyncSession,
 	topic_id: int,
 	user_id: uuid.UUID,
-	translation: TranslationCreateRequst,
-	translation_code: Translation
+	translation: TranslationCreateRequst
 ) -> TopicTranslationCreated:
 	new_translation = schema.TopicTranslation(
 		translation_id    = translation.translation_code_id,
@@ -259,17 +245,8 @@ async def add_translation(
 	await db.commit()
 	await db.refresh(new_translation)
 
-	if await topic_cache.exist(topic_id):
-		topic_translation = TopicTranslationBase(
-			id=new_translation.id,
-			topic_id=topic_id,
-			parse_mode=new_translation.parse_mode,
-			text=new_translation.text,
-			translation_code=translation_code.translation_code,
-			full_name=translation_code.full_name,
-		)
-		await topic_translation_cache.set(new_translation.id, topic_translation)
-		await topic_cache.add_relation(topic_id, EntityType.topic_translation, new_translation.id)
+	await topic_cache.invalidate(topic_id)
+	await topic_translation_cache.invalidate(new_translation.id)
 
 	return topics.TopicTranslationCreated.model_validate(new_translation)
 
@@ -293,7 +270,7 @@ async def create_base_translation(db: AsyncSession) -> None:
 
 
 
-async def change_name(topic_id: int, topic: topics.TopicBase, topic_name: str, db: AsyncSession) -> str:
+async def change_name(topic_id: int, topic_name: str, db: AsyncSession) -> str:
 	name_hash = hash_topic_name(topic_name)
 
 	await db.execute(
@@ -307,9 +284,7 @@ async def change_name(topic_id: int, topic: topics.TopicBase, topic_name: str, d
 	)
 	await db.commit()
 
-	if await topic_cache.exist(topic_id):
-		topic.name = topic_name
-		await topic_cache.set(topic_id, topic)
+	await topic_cache.invalidate(topic_id)
 
 	return name_hash
 
@@ -318,7 +293,6 @@ async def edit_translation(
 	db: AsyncSession,
 	topic_id: int,
 	translation_id: int,
-	translation: topics.TopicTranslationBase,
 	translation_req: TranslationEditRequest,
 	user_id: uuid.UUID
 ) -> None:
@@ -357,11 +331,7 @@ async def edit_translation(
 	)
 	await db.commit()
 
-	if await topic_translation_cache.exist(translation_id):
-		translation.parse_mode = translation_req.parse_mode
-		translation.text       = translation_req.text
-
-		await topic_translation_cache.set(translation_id, translation)
+	await topic_translation_cache.invalidate(translation_id)
 
 
 async def delete_by_id(topic_id: int, db: AsyncSession) -> None:
@@ -370,7 +340,7 @@ async def delete_by_id(topic_id: int, db: AsyncSession) -> None:
 		.where(schema.Topic.id == topic_id)
 	)
 	await db.commit()
-	await topic_cache.delete(topic_id)
+	await topic_cache.invalidate(topic_id)
 
 
 async def delete_translation_by_id(topic_id: int, translation_id: int, db: AsyncSession) -> bool:
@@ -394,7 +364,7 @@ async def delete_translation_by_id(topic_id: int, translation_id: int, db: Async
 	)
 	await db.commit()
 
-	await topic_translation_cache.delete(translation_id)
+	await topic_translation_cache.invalidate(translation_id)
 	return True
 
 
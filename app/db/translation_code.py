@@ -2,7 +2,6 @@ from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..config import settings
 from ..redis.cache import translation_cache
 from ..schema import translation_code as tc
 from ..schema.translation_code import Translation
@@ -16,20 +15,14 @@ async def get_translation_code_list(db: AsyncSession) -> list[tc.Translation]:
 	return [tc.Translation.model_validate(obj) for obj in res.all()]
 
 async def get_translation_code_by_id(translation_code_id: int, db: AsyncSession) -> Translation | None:
-	count = await translation_cache.incr(translation_code_id)
-	cached = await translation_cache.get(translation_code_id)
-	if cached:
-		return cached
+	async def load() -> Translation | None:
+		result = await db.get(schema.Translation, translation_code_id)
+		if result is None:
+			return None
 
-	result = await db.get(schema.Translation, translation_code_id)
-	if result is None:
-		return None
+		return Translation.model_validate(result)
 
-	translation = Translation.model_validate(result)
-	if count >= settings.CACHE_THRESHOLD:
-		await translation_cache.set(translation_code_id, translation)
-
-	return translation
+	return await translation_cache.fetch(translation_code_id, load)
 
 
 async def create_translation_code(db: AsyncSession, translation: tc.TranslationCodeCreateRequest) -> int | None:
@@ -42,7 +35,12 @@ async def create_translation_code(db: AsyncSession, translation: tc.TranslationC
 
 	result = await db.execute(query)
 	await db.commit()
-	return result.scalar_one_or_none()
+	translation_id = result.scalar_one_or_none()
+
+	if translation_id is not None:
+		await translation_cache.invalidate(translation_id)
+
+	return translation_id
 
 
 async def delete_translation_code(db: AsyncSession, translation_id: int) -> bool:
@@ -61,4 +59,5 @@ async def delete_translation_code(db: AsyncSession, translation_id: int) -> bool
 
     await db.delete(translation)
     await db.commit()
+    await translation_cache.invalidate(translation_id)
     return True
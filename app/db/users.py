@@ -1,13 +1,16 @@
 import uuid
+from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Select, select
 
 from . import schema
 from .. import config
+from ..redis.principal import principal_cache
 from ..schema.users import UserCreateRequest
 from ..utils.security import hash_password
 from .application_parameter import set_default_value
+from .pagination import keyset_page
 
 
 class DatabaseCorruptUsersException(Exception):
@@ -20,14 +23,35 @@ class RootUserException(Exception):
 		super().__init__("Cannot modify the root user")
 
 
-async def get_users_list(db: AsyncSession) -> list[schema.User]:
-	res = await db.execute(select(schema.User))
-	return res.scalars().all()
+def users_list_query(role: Optional[schema.UserRoles] = None,
+					 is_disabled: Optional[bool] = None,
+					 username_prefix: Optional[str] = None) -> Select:
+	stmt = select(schema.User)
+
+	if role is not None:
+		stmt = stmt.where(schema.User.role == role)
+
+	if is_disabled is not None:
+		stmt = stmt.where(schema.User.is_disabled == is_disabled)
+
+	if username_prefix:
+		stmt = stmt.where(schema.User.username.startswith(username_prefix, autoescape=True))
+
+	return stmt
+
+
+async def get_users_list(db: AsyncSession,
+						 cursor: Optional[uuid.UUID] = None,
+						 limit: int = 50,
+						 role: Optional[schema.UserRoles] = None,
+						 is_disabled: Optional[bool] = None,
+						 username_prefix: Optional[str] = None) -> tuple[list[schema.User], Optional[uuid.UUID]]:
+	stmt = users_list_query(role, is_disabled, username_prefix)
+	return await keyset_page(db, stmt, schema.User.id, cursor, limit)
 
 
 async def get_user_by_id(db: AsyncSession, user_id: uuid.UUID) -> schema.User | None:
-	res = await db.execute(select(schema.User).where(schema.User.id == user_id))
-	return res.scalars().first()
+	return await db.get(schema.User, user_id)
 
 
 async def get_user_by_username(db: AsyncSession, username: str) -> schema.User | None:
@@ -54,7 +78,7 @@ async def create_root_user(db: AsyncSession):
 
 	root_user = schema.User(
 		username="root",
-		password_hash=hash_password("root"),
+		password_hash=await hash_password("root"),
 		role=schema.UserRoles.admin,
 		force_password_change=True,
 		is_disabled=False
@@ -82,6 +106,7 @@ async def change_user_availability(db: AsyncSession, user_id: uuid.UUID, is_disa
 
 	db.add(user)
 	await db.commit()
+	await principal_cache.invalidate(user_id)
 	await db.refresh(user)
 
 	return user
@@ -90,7 +115,7 @@ async def change_user_availability(db: AsyncSession, user_id: uuid.UUID, is_disa
 async def create_user(db: AsyncSession, user: UserCreateRequest) -> schema.User:
 	new_user = schema.User(
 		username=user.username,
-		password_hash=hash_password(user.password),
+		password_hash=await hash_password(user.password),
 		role=user.role,
 		is_disabled=user.is_disabled,
 		force_password_change=user.force_password_change
@@ -115,6 +140,7 @@ async def update_role(db: AsyncSession, user_id: uuid.UUID, new_role: schema.Use
 	user.role = new_role
 	db.add(user)
 	await db.commit()
+	await principal_cache.invalidate(user_id)
 	await db.refresh(user)
 
 	return user
@@ -131,6 +157,7 @@ async def delete_user(db: AsyncSession, user_id: uuid.UUID) -> bool:
 
 	await db.delete(user)
 	await db.commit()
+	await principal_cache.invalidate(user_id)
 
 	return True
 
@@ -166,10 +193,11 @@ async def change_password(db: AsyncSession,
 	if not user:
 		return False
 
-	user.password_hash = hash_password(new_password)
+	user.password_hash = await hash_password(new_password)
 	user.force_password_change = force_password_change
 
 	db.add(user)
 	await db.commit()
+	await principal_cache.invalidate(user_id)
 
 	return True
\ No newline at end of file
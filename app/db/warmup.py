@@ -0,0 +1,110 @@
+import time
+from collections import defaultdict
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db.enums import EntityType
+from ..redis.cache import category_cache, tag_cache, topic_cache, topic_translation_cache
+from ..redis.client import redis
+from ..schema.category import CategoryBase
+from ..schema.tag import TagBase
+from ..schema.topics import TopicBase, TopicTranslationBase
+from . import popularity, schema
+
+
+async def warm_topic_cache(db: AsyncSession, limit: int) -> dict[str, Any]:
+	started = time.perf_counter()
+	topic_ids = await popularity.get_top_topic_ids(db, limit)
+
+	# Every stamp is read before the rows it covers, so a write committed during
+	# the warm-up fails the stamp check instead of being cached as current
+	topic_stamps = await topic_cache.stamp_map(topic_ids)
+
+	translation_ids = await db.scalars(
+		select(schema.TopicTranslation.id).where(schema.TopicTranslation.topic_id.in_(topic_ids))
+	)
+	tag_ids = await db.scalars(
+		select(schema.TagInTopic.tag_id).where(schema.TagInTopic.topic_id.in_(topic_ids)).distinct()
+	)
+	category_ids = await db.scalars(
+		select(schema.Topic.category_id).where(schema.Topic.id.in_(topic_ids)).distinct()
+	)
+	translation_stamps = await topic_translation_cache.stamp_map(list(translation_ids.all()))
+	tag_stamps = await tag_cache.stamp_map(list(tag_ids.all()))
+	category_stamps = await category_cache.stamp_map(list(category_ids.all()))
+
+	topic_rows = await db.scalars(select(schema.Topic).where(schema.Topic.id.in_(topic_ids)))
+	topic_list = [TopicBase.model_validate(row) for row in topic_rows.all()]
+	ids = [obj.id for obj in topic_list]
+
+	translation_rows = await db.execute(
+		select(
+			schema.TopicTranslation.id,
+			schema.TopicTranslation.topic_id,
+			schema.TopicTranslation.parse_mode,
+			schema.TopicTranslation.text,
+			schema.Translation.translation_code,
+			schema.Translation.full_name,
+		)
+		.join(
+			schema.Translation,
+			schema.Translation.id == schema.TopicTranslation.translation_id,
+		)
+		.where(schema.TopicTranslation.topic_id.in_(ids))
+		.order_by(schema.TopicTranslation.id)
+	)
+	translations = [TopicTranslationBase.model_validate(row) for row in translation_rows.mappings().all()]
+
+	tag_rows = await db.execute(
+		select(schema.TagInTopic.topic_id, schema.Tag)
+		.join(schema.Tag, schema.Tag.id == schema.TagInTopic.tag_id)
+		.where(schema.TagInTopic.topic_id.in_(ids))
+		.order_by(schema.Tag.name, schema.Tag.id)
+	)
+	tags: dict[int, TagBase] = {}
+	tag_ids_by_topic: dict[int, list[int]] = defaultdict(list)
+
+	for topic_id, row in tag_rows.all():
+		tags[row.id] = TagBase.model_validate(row)
+		tag_ids_by_topic[topic_id].append(row.id)
+
+	category_rows = await db.scalars(
+		select(schema.Category).where(schema.Category.id.in_({obj.category_id for obj in topic_list}))
+	)
+	categories = [CategoryBase.model_validate(row) for row in category_rows.all()]
+
+	translation_ids_by_topic: dict[int, list[int]] = defaultdict(list)
+
+	for obj in translations:
+		translation_ids_by_topic[obj.topic_id].append(obj.id)
+
+	pipe = redis.pipeline(transaction = False)
+	await topic_cache.set_many(topic_list, [topic_stamps.get(obj.id, "") for obj in topic_list], pipe)
+	await topic_translation_cache.set_many(translations, [translation_stamps.get(obj.id, "") for obj in translations], pipe)
+	await tag_cache.set_many(list(tags.values()), [tag_stamps.get(tag_id, "") for tag_id in tags], pipe)
+	await category_cache.set_many(categories, [category_stamps.get(obj.id, "") for obj in categories], pipe)
+
+	for obj in topic_list:
+		stamp = topic_stamps.get(obj.id, "")
+
+		# Breaker open or the topic namespace is stale
+		if not stamp:
+			continue
+
+		topic_cache.set_relation_ids(pipe, obj.id, EntityType.topic_translation, translation_ids_by_topic[obj.id], stamp)
+		topic_cache.set_relation_ids(pipe, obj.id, EntityType.tag, tag_ids_by_topic[obj.id], stamp)
+		topic_cache.prime(obj.id)
+		topic_cache.prime(obj.id, EntityType.topic_translation)
+		topic_cache.prime(obj.id, EntityType.tag)
+		# get_topic_category counts admission under the topic id
+		category_cache.prime(obj.id)
+
+	await pipe.execute()
+
+	return {
+		"topics": len(topic_list),
+		"keys": len(topic_list) * 3 + len(translations) + len(tags) + len(categories),
+		"elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+	}
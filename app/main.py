@@ -1,3 +1,4 @@
+import asyncio
 import os
 import uuid
 import platform
@@ -6,13 +7,19 @@ from datetime import datetime
 import fastapi
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import asynccontextmanager
 from colorama import Fore, Style
 from user_agents import parse
 
-from .db import init_db, get_session, users, topic, media, application_parameter as ap, tasks as tasks_db
+from .db import init_db, get_session, users, topic, media, application_parameter as ap, tasks as tasks_db, jwt as jwt_db, popularity, warmup
 from . import __version__, __release_subname__, config, tasks, routers
+from .redis import cache, invalidation
+from .redis.breaker import cache_breaker
+from .redis.tracking import client_side_cache
+from .utils import security
+from .utils.password_pool import password_pool
 
 
 async def init_config(db: AsyncSession):
@@ -52,20 +59,56 @@ async def lifespan(app: FastAPI):
 
 	session_generator = get_session()
 	session = await anext(session_generator)
+	invalidation_listener = None
+	tracking_listener = None
+	breaker_probe = None
 
 	await init_config(session)
 
 	try:
+		await jwt_db.maintain_jwt_partitions(session, config.settings.JWT_PARTITION_MONTHS_AHEAD)
 		await ap.init_ap(session)
 		await init_config(session)
+		await security.calibrate_password_hashing()
 		await users.create_root_user(session)
+		await jwt_db.rebuild_revocation_registry(session)
 		await topic.create_base_translation(session)
 		await media.init_media(session)
 		await tasks_db.init_tasks(session)
 		await tasks.schedule_tasks(session)
+
+		if config.settings.CACHE_WARMUP_ON_STARTUP:
+			try:
+				report = await warmup.warm_topic_cache(session, config.settings.CACHE_WARMUP_TOPICS)
+				print(f"Cache warm-up: {report['topics']} topics, {report['keys']} keys in {report['elapsed_ms']} ms")
+			except RedisError as e:
+				print(f"Cache warm-up skipped: {e}")
+
+		breaker_probe = asyncio.create_task(cache_breaker.run(cache.flush_stale))
+
+		if config.settings.CACHE_L1_ENABLED:
+			invalidation_listener = asyncio.create_task(
+				invalidation.listen_invalidations(cache.drop_local, cache.clear_local)
+			)
+
+		if config.settings.CACHE_CLIENT_TRACKING:
+			tracking_listener = asyncio.create_task(client_side_cache.run(cache.tracked_prefixes()))
+
 		yield
 	finally:
+		if invalidation_listener is not None:
+			invalidation_listener.cancel()
+
+		if tracking_listener is not None:
+			tracking_listener.cancel()
+
+		if breaker_probe is not None:
+			breaker_probe.cancel()
+
+		await jwt_db.flush_last_used(session)
+		await popularity.flush_topic_hits(session)
 		await session.close()
+		password_pool.shutdown()
 
 
 app = FastAPI(title=config.settings.APP_NAME, version=__version__, lifespan=lifespan)
@@ -0,0 +1,97 @@
+import random
+from array import array
+from typing import Protocol
+
+from ..config import settings
+
+
+class AdmissionPolicy(Protocol):
+	def should_admit(self, key: str) -> bool: ...
+	def prime(self, key: str) -> None: ...
+
+
+class AlwaysAdmit:
+	def should_admit(self, key: str) -> bool:
+		return True
+
+
+	def prime(self, key: str) -> None:
+		pass
+
+
+class FrequencySketch:
+	MAX_COUNT = 255
+
+	def __init__(self, width: int, depth: int, sample_size: int):
+		self.width = width
+		self.sample_size = sample_size
+		self.additions = 0
+		self.seeds = [random.getrandbits(32) for _ in range(depth)]
+		self.rows = [array("B", bytes(width)) for _ in range(depth)]
+
+
+	def _indexes(self, key: str) -> list[int]:
+		return [hash((seed, key)) % self.width for seed in self.seeds]
+
+
+	def increment(self, key: str) -> int:
+		indexes = self._indexes(key)
+		estimate = min(row[index] for row, index in zip(self.rows, indexes))
+
+		if estimate < self.MAX_COUNT:
+			# Conservative update: only the smallest counters grow
+			for row, index in zip(self.rows, indexes):
+				if row[index] == estimate:
+					row[index] = estimate + 1
+
+			estimate += 1
+
+		self.additions += 1
+
+		if self.additions >= self.sample_size:
+			self._decay()
+
+		return estimate
+
+
+	def _decay(self) -> None:
+		for row in self.rows:
+			for index, value in enumerate(row):
+				if value:
+					row[index] = value >> 1
+
+		self.additions //= 2
+
+
+class TinyLFUAdmission:
+	def __init__(self, sketch: FrequencySketch, threshold: int):
+		self.sketch = sketch
+		self.threshold = threshold
+
+
+	def should_admit(self, key: str) -> bool:
+		return self.sketch.increment(key) >= self.threshold
+
+
+	def prime(self, key: str) -> None:
+		# The next read adds the last count and is admitted
+		for _ in range(self.threshold - 1):
+			self.sketch.increment(key)
+
+
+def build_admission_policy() -> AdmissionPolicy:
+	match settings.CACHE_ADMISSION_POLICY:
+		case "always":
+			return AlwaysAdmit()
+		case "tinylfu":
+			sketch = FrequencySketch(
+				settings.CACHE_SKETCH_WIDTH,
+				settings.CACHE_SKETCH_DEPTH,
+				settings.CACHE_SKETCH_SAMPLE_SIZE
+			)
+			return TinyLFUAdmission(sketch, settings.CACHE_THRESHOLD)
+		case _:
+			raise ValueError(f"Unknown cache admission policy {settings.CACHE_ADMISSION_POLICY}")
+
+
+admission_policy = build_admission_policy()
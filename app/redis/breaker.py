@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, TypeVar
+
+from redis.exceptions import ConnectionError, RedisError, TimeoutError as RedisTimeoutError
+
+from ..config import settings
+from .client import redis
+
+R = TypeVar("R")
+
+logger = logging.getLogger(__name__)
+
+
+class CacheUnavailable(RedisError):
+	# A RedisError so existing fallbacks (single-flight locks, warm-up) treat it like an outage
+	pass
+
+
+class BreakerState(str, Enum):
+	closed = "closed"
+	open = "open"
+	half_open = "half_open"
+
+
+class CircuitBreaker:
+	def __init__(self, failure_threshold: int, cool_down: float, call_timeout: float, probe_interval: float):
+		self.failure_threshold = failure_threshold
+		self.cool_down = cool_down
+		self.call_timeout = call_timeout
+		self.probe_interval = probe_interval
+		self.state = BreakerState.closed
+		self.opened_at = 0.0
+		self.consecutive_failures = 0
+		self.failures = 0
+		self.timeouts = 0
+		self.rejected = 0
+		self.transitions = {state: 0 for state in BreakerState}
+
+
+	def _change(self, state: BreakerState) -> None:
+		if state == BreakerState.open:
+			self.opened_at = time.monotonic()
+
+		if state != self.state:
+			self.state = state
+			self.transitions[state] += 1
+			if state == BreakerState.open:
+				logger.warning("Redis circuit breaker open after %d consecutive failures", self.consecutive_failures)
+			else:
+				logger.info("Redis circuit breaker %s", state.value)
+
+
+	def allow(self) -> bool:
+		if self.state == BreakerState.open and time.monotonic() - self.opened_at >= self.cool_down:
+			self._change(BreakerState.half_open)
+
+		return self.state != BreakerState.open
+
+
+	def record_success(self) -> None:
+		self.consecutive_failures = 0
+
+		if self.state != BreakerState.closed:
+			self._change(BreakerState.closed)
+
+
+	def record_failure(self) -> None:
+		self.failures += 1
+		self.consecutive_failures += 1
+
+		# A failed trial call reopens at once
+		if self.state == BreakerState.half_open or self.consecutive_failures >= self.failure_threshold:
+			self._change(BreakerState.open)
+
+
+	async def call(self, call: Awaitable[R]) -> R:
+		if not self.allow():
+			if asyncio.iscoroutine(call):
+				call.close()
+
+			self.rejected += 1
+			raise CacheUnavailable("Redis circuit breaker is open")
+
+		try:
+			result = await asyncio.wait_for(call, self.call_timeout)
+		except asyncio.TimeoutError as e:
+			self.timeouts += 1
+			self.record_failure()
+			raise CacheUnavailable("Redis call timed out") from e
+		except (ConnectionError, RedisTimeoutError, OSError) as e:
+			self.record_failure()
+			raise CacheUnavailable(str(e)) from e
+		except RedisError as e:
+			# Redis answered (WRONGTYPE, script errors): only this call falls back
+			self.record_success()
+			raise CacheUnavailable(str(e)) from e
+
+		self.record_success()
+
+		return result
+
+
+	async def run(self, on_healthy: Callable[[], Awaitable[None]]) -> None:
+		# Probes with PING instead of letting a request be the trial call, and
+		# replays work deferred while Redis was unreachable once it answers again
+		while True:
+			await asyncio.sleep(self.probe_interval)
+
+			if self.state != BreakerState.closed and self.allow():
+				try:
+					await self.call(redis.ping())
+				except CacheUnavailable:
+					continue
+
+			if self.state == BreakerState.closed:
+				try:
+					await on_healthy()
+				except RedisError:
+					pass
+
+
+	def metrics(self) -> dict[str, Any]:
+		return {
+			"state": self.state,
+			"consecutive_failures": self.consecutive_failures,
+			"failures": self.failures,
+			"timeouts": self.timeouts,
+			"rejected": self.rejected,
+			"transitions": {state.value: count for state, count in self.transitions.items()},
+		}
+
+
+cache_breaker = CircuitBreaker(
+	settings.CACHE_BREAKER_FAILURE_THRESHOLD,
+	settings.CACHE_BREAKER_COOL_DOWN,
+	settings.CACHE_BREAKER_CALL_TIMEOUT,
+	settings.CACHE_BREAKER_PROBE_INTERVAL
+)
@@ -1,22 +1,88 @@
 import json
-from typing import Any, Generic, Optional, Type, TypeVar
+import random
+import time
+from typing import Any, Awaitable, Callable, Generic, NamedTuple, Optional, Type, TypeVar
 
 from pydantic import BaseModel
 
+from ..config import settings
 from ..db.enums import EntityType
 from ..schema.category import CategoryBase
+from ..schema.media import MediaInformation
 from ..schema.topics import TopicBase, TopicTranslationBase
 from ..schema.translation_code import Translation
 from ..schema.tag import TagBase
-from .client import redis
+from ..utils.lru import LocalLRUCache
+from ..utils.metrics import SIZE_BUCKETS, Histogram, prometheus_counter, prometheus_gauge, prometheus_histogram
+from .admission import admission_policy
+from .breaker import BreakerState, CacheUnavailable, cache_breaker
+from .client import AsyncRedisPipelineProtocol, redis
+from .invalidation import publish_invalidation
+from .scripts import lookup_relations_script, lookup_topic_category_script
+from .serializer import FORMAT_TAG, CacheSerializer, JsonModelSerializer
+from .single_flight import single_flight
+from .tracking import client_side_cache
 
 T = TypeVar("T", bound = BaseModel)
+R = TypeVar("R")
+
+# Payload of a negative entry, serialized values always start with their format tag
+MISSING = "!"
+
+
+class CacheLookup(NamedTuple, Generic[T]):
+	value: Optional[T]
+	stamp: str
+	missing: bool = False
+
+
+class CacheMetrics:
+	def __init__(self):
+		self.hits = 0
+		self.misses = 0
+		self.negative_hits = 0
+		self.fills = 0
+		self.invalidations = 0
+		self.latency = Histogram()
+		self.payload_bytes = Histogram(SIZE_BUCKETS)
+
+
+	def snapshot(self) -> dict[str, Any]:
+		reads = self.hits + self.misses
+
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"hit_ratio": self.hits / reads if reads else 0.0,
+			"negative_hits": self.negative_hits,
+			"fills": self.fills,
+			"invalidations": self.invalidations,
+			"latency": self.latency.snapshot(),
+			"payload_bytes": self.payload_bytes.snapshot(),
+		}
 
 
 class RedisEntityCache(Generic[T]):
-	def __init__(self, entity_type: EntityType, model: Type[T]):
+	def __init__(self,
+		entity_type: EntityType,
+		model: Type[T],
+		ttl: int,
+		serializer: Optional[CacheSerializer[T]] = None,
+		tracked: bool = False
+	):
 		self.entity_type = entity_type
 		self.model = model
+		self.ttl = ttl
+		# Outlives every value stamped with it, so an expired counter can never
+		# restart at a generation that still has data behind it
+		self.gen_ttl = ttl + int(ttl * settings.CACHE_TTL_JITTER) + 1
+		self.serializer = serializer or JsonModelSerializer(model)
+		self.tracked = tracked and settings.CACHE_CLIENT_TRACKING
+		self.metrics = CacheMetrics()
+		self.local: Optional[LocalLRUCache[T]] = (
+			LocalLRUCache(settings.CACHE_L1_SIZE, settings.CACHE_L1_TTL)
+			if settings.CACHE_L1_ENABLED else None
+		)
 
 
 	@staticmethod
@@ -41,134 +107,542 @@ class RedisEntityCache(Generic[T]):
 		return self._key(self.entity_type, entity_id)
 
 
-	def cascade_key(self, entity_id: int) -> str:
-		return self._key(self.entity_type, entity_id, suffix = "cascade")
+	def gen_key(self, entity_id: int) -> str:
+		return self._key(self.entity_type, entity_id, suffix = "gen")
+
+
+	def namespace_gen_key(self) -> str:
+		return f"{self.entity_type.value}:gen"
 
 
 	def relation_key(self, entity_id: int, related_type: EntityType) -> str:
 		return self._key(self.entity_type, entity_id, related_type)
 
 
-	def back_relation_key(self, entity_id: int) -> str:
-		return self._key(self.entity_type, entity_id, suffix = "back-relation")
+	def expiry(self) -> int:
+		return self.ttl + random.randint(0, int(self.ttl * settings.CACHE_TTL_JITTER))
+
 
+	@staticmethod
+	def _stamp(namespace_gen: Optional[str], gen: Optional[str]) -> str:
+		return f"{namespace_gen or 0}.{gen or 0}"
 
-	async def exist(self, entity_id: int, relation_type: Optional[EntityType] = None) -> int:
-		return await redis.exists(self._key(self.entity_type, entity_id, relation_type))
 
+	@staticmethod
+	def _unstamp(raw: Any, stamp: str) -> Optional[str]:
+		if not isinstance(raw, str):
+			return None
 
-	async def set(self, entity_id: int, obj: T) -> None:
-		def checknull(value):
-			if value is None:
-				return "null"
-			
-			return value
+		value_stamp, _, payload = raw.partition("|")
 
-		mapping = {
-			key: checknull(value) 
-			for key, value in obj.model_dump(mode="json").items()
-		}
+		return payload if value_stamp == stamp else None
+
+
+	def _mget(self, *keys: str) -> Awaitable[list[Any]]:
+		return client_side_cache.mget(*keys) if self.tracked else redis.mget(*keys)
+
+
+	async def _roundtrip(self, call: Awaitable[R]) -> R:
+		start = time.perf_counter()
+
+		try:
+			return await cache_breaker.call(call)
+		finally:
+			self.metrics.latency.observe(time.perf_counter() - start)
+
+
+	def _count_read(self, raw: Any, hit: bool) -> None:
+		if hit:
+			self.metrics.hits += 1
+			self.metrics.payload_bytes.observe(len(raw))
+		else:
+			self.metrics.misses += 1
+
+
+	def _decode(self, raw: Any, stamp: str) -> Optional[T]:
+		payload = self._unstamp(raw, stamp)
 
-		await redis.hset(self.key(entity_id), mapping = mapping)
+		return self.serializer.loads(payload) if payload is not None else None
+
+
+	def _write(self, pipe: AsyncRedisPipelineProtocol, name: str, entity_id: int, value: str) -> None:
+		pipe.set(name, value, ex = self.expiry())
+		pipe.expire(self.gen_key(entity_id), self.gen_ttl)
+		self.metrics.fills += 1
+		self.metrics.payload_bytes.observe(len(value))
+
+
+	def should_admit(self, entity_id: int, relation_type: Optional[EntityType] = None) -> bool:
+		return admission_policy.should_admit(self._key(self.entity_type, entity_id, relation_type))
+
+
+	def prime(self, entity_id: int, relation_type: Optional[EntityType] = None) -> None:
+		admission_policy.prime(self._key(self.entity_type, entity_id, relation_type))
+
+
+	async def lookup(self, entity_id: int) -> CacheLookup[T]:
+		# The stamp is what a fill after a miss must be written with
+		if self.local is not None:
+			local = self.local.get(entity_id)
+
+			if local is not None:
+				return CacheLookup(local.model_copy(), "")
+
+		# Values may predate a lost invalidation until flush_stale bumps the namespace
+		if self.entity_type in stale_caches:
+			return CacheLookup(None, "")
+
+		local_epoch = self.local.epoch if self.local is not None else 0
+
+		try:
+			raw, namespace_gen, gen = await self._roundtrip(self._mget(
+				self.key(entity_id), self.namespace_gen_key(), self.gen_key(entity_id)
+			))
+		except CacheUnavailable:
+			# No stamp, nothing gets written back
+			return CacheLookup(None, "")
+
+		stamp = self._stamp(namespace_gen, gen)
+
+		if self._unstamp(raw, stamp) == MISSING:
+			self.metrics.negative_hits += 1
+			return CacheLookup(None, stamp, missing = True)
+
+		obj = self._decode(raw, stamp)
+		self._count_read(raw, obj is not None)
+
+		# An eviction that arrived while the read was in flight wins over its result
+		if obj is not None and self.local is not None and self.local.epoch == local_epoch:
+			self.local.put(entity_id, obj.model_copy())
+
+		return CacheLookup(obj, stamp)
 
 
 	async def get(self, entity_id: int) -> Optional[T]:
-		raw = await redis.hgetall(self.key(entity_id))
+		return (await self.lookup(entity_id)).value
+
+
+	async def fetch(self,
+		entity_id: int,
+		load: Callable[[], Awaitable[Optional[R]]]
+	) -> Optional[R]:
+		admitted = self.should_admit(entity_id)
+		stamp = ""
+
+		if admitted:
+			lookup = await self.lookup(entity_id)
+
+			if lookup.missing:
+				return None
+
+			if lookup.value is not None:
+				return lookup.value
+
+			stamp = lookup.stamp
+
+		async def load_and_fill() -> Optional[R]:
+			obj = await load()
+
+			if admitted and stamp:
+				if obj is None:
+					await self.set_missing(entity_id, stamp)
+				else:
+					await self.set(entity_id, obj, stamp)
 
-		if not raw:
+			return obj
+
+		return await single_flight.do(
+			self.key(entity_id),
+			load_and_fill,
+			(lambda: self.get(entity_id)) if admitted and stamp else None
+		)
+
+
+	async def stamps(self, entity_ids: list[int]) -> list[str]:
+		if not entity_ids:
+			return []
+
+		if self.entity_type in stale_caches:
+			return [""] * len(entity_ids)
+
+		try:
+			namespace_gen, *gens = await self._roundtrip(self._mget(
+				self.namespace_gen_key(), *[self.gen_key(entity_id) for entity_id in entity_ids]
+			))
+		except CacheUnavailable:
+			return [""] * len(entity_ids)
+
+		return [self._stamp(namespace_gen, gen) for gen in gens]
+
+
+	async def stamp_map(self, entity_ids: list[int]) -> dict[int, str]:
+		return dict(zip(entity_ids, await self.stamps(entity_ids)))
+
+
+	def _decode_many(self, raws: list[Any], gens: list[Any], namespace_gen: Optional[str]) -> Optional[list[T]]:
+		objs = [self._decode(raw, self._stamp(namespace_gen, gen)) for raw, gen in zip(raws, gens)]
+
+		for raw, obj in zip(raws, objs):
+			self._count_read(raw, obj is not None)
+
+		# A partial list would differ from the database result
+		if any(obj is None for obj in objs):
 			return None
-		
-		object = {}
 
-		for key, value in raw.items():
-			if value == "null":
-				object[key] = None
-				continue
-			object[key] = value
+		return objs
 
-		print(object)
 
-		return self.model.model_validate(object)
+	async def set(self, entity_id: int, obj: T, stamp: str) -> None:
+		if not stamp:
+			return
 
+		pipe = redis.pipeline()
+		self._write(pipe, self.key(entity_id), entity_id, f"{stamp}|{self.serializer.dumps(obj)}")
 
-	async def incr(self, entity_id: int, relation_type: Optional[EntityType] = None) -> int:
-		return await redis.incr(self._key(self.entity_type, entity_id, relation_type, "count"))
+		# Not put into L1: the stamp may already be stale, the next lookup verifies it
+		try:
+			await self._roundtrip(pipe.execute())
+		except CacheUnavailable:
+			pass
 
 
-	async def add_cascade(self,
-		entity_id: int,
-		related_type: EntityType,
-		related_id: int
+	async def set_missing(self, entity_id: int, stamp: str) -> None:
+		if not stamp:
+			return
+
+		pipe = redis.pipeline()
+		pipe.set(self.key(entity_id), f"{stamp}|{MISSING}", ex = settings.CACHE_NEGATIVE_TTL)
+		pipe.expire(self.gen_key(entity_id), self.gen_ttl)
+
+		try:
+			await self._roundtrip(pipe.execute())
+		except CacheUnavailable:
+			pass
+
+
+	async def set_many(self,
+		objs: list[T],
+		stamps: list[str],
+		pipe: Optional[AsyncRedisPipelineProtocol] = None
 	) -> None:
-		await redis.sadd(self.cascade_key(entity_id), self._key(related_type, related_id))
+		own_pipe = pipe is None
+		pipe = redis.pipeline() if own_pipe else pipe
+
+		for obj, stamp in zip(objs, stamps):
+			if not stamp:
+				continue
+
+			self._write(pipe, self.key(obj.id), obj.id, f"{stamp}|{self.serializer.dumps(obj)}")
+
+		if own_pipe:
+			try:
+				await self._roundtrip(pipe.execute())
+			except CacheUnavailable:
+				pass
+
 
+	async def lookup_relations(self, entity_id: int, related_type: EntityType) -> CacheLookup[list[BaseModel]]:
+		related_cache = entity_caches[related_type]
 
-	async def add_relation(self,
+		if {self.entity_type, related_type} & stale_caches:
+			return CacheLookup(None, "")
+
+		try:
+			raw, namespace_gen, gen, related_namespace_gen, *members = await self._roundtrip(lookup_relations_script(
+				keys = [
+					self.relation_key(entity_id, related_type),
+					self.namespace_gen_key(),
+					self.gen_key(entity_id),
+					related_cache.namespace_gen_key(),
+				],
+				args = [f"{related_type.value}:", MISSING]
+			))
+		except CacheUnavailable:
+			return CacheLookup(None, "")
+
+		stamp = self._stamp(namespace_gen, gen)
+		payload = self._unstamp(raw, stamp)
+
+		if payload == MISSING:
+			self.metrics.negative_hits += 1
+			return CacheLookup(None, stamp, missing = True)
+
+		self._count_read(raw, payload is not None)
+
+		if payload is None:
+			return CacheLookup(None, stamp)
+
+		# Ids are stored in the order of the database query, collation included
+		return CacheLookup(related_cache._decode_many(members[0::2], members[1::2], related_namespace_gen), stamp)
+
+
+	async def get_relations(self, entity_id: int, related_type: EntityType) -> Optional[list[BaseModel]]:
+		return (await self.lookup_relations(entity_id, related_type)).value
+
+
+	async def set_relations(self,
 		entity_id: int,
 		related_type: EntityType,
-		related_id: int
+		objs: list[BaseModel],
+		stamp: str,
+		related_stamps: dict[int, str]
 	) -> None:
-		await redis.sadd(self.relation_key(entity_id, related_type), self._key(related_type, related_id))
+		if not stamp:
+			return
+
+		related_cache = entity_caches[related_type]
+		ids = [obj.id for obj in objs]
+
+		# Members the caller did not stamp before its query are left out
+		pipe = redis.pipeline()
+		await related_cache.set_many(objs, [related_stamps.get(related_id, "") for related_id in ids], pipe)
+		self.set_relation_ids(pipe, entity_id, related_type, ids, stamp)
 
+		try:
+			await self._roundtrip(pipe.execute())
+		except CacheUnavailable:
+			pass
 
-	async def add_back_relation(self,
+
+	async def set_relations_missing(self, entity_id: int, related_type: EntityType, stamp: str) -> None:
+		if not stamp:
+			return
+
+		pipe = redis.pipeline()
+		pipe.set(self.relation_key(entity_id, related_type), f"{stamp}|{MISSING}", ex = settings.CACHE_NEGATIVE_TTL)
+		pipe.expire(self.gen_key(entity_id), self.gen_ttl)
+
+		try:
+			await self._roundtrip(pipe.execute())
+		except CacheUnavailable:
+			pass
+
+
+	def set_relation_ids(self,
+		pipe: AsyncRedisPipelineProtocol,
 		entity_id: int,
 		related_type: EntityType,
-		related_id: int,
+		related_ids: list[int],
+		stamp: str
 	) -> None:
-		await redis.sadd(self.back_relation_key(entity_id), self._key(related_type, related_id))
+		self._write(pipe, self.relation_key(entity_id, related_type), entity_id, f"{stamp}|{json.dumps(related_ids)}")
 
 
-	async def get_relations(self, entity_id: int, related_type: EntityType) -> list[Any]:
-		relation_keys = await redis.smembers(self.relation_key(entity_id, related_type))
+	async def invalidate(self, entity_id: int) -> None:
 		pipe = redis.pipeline()
+		pipe.incr(self.gen_key(entity_id))
+		pipe.expire(self.gen_key(entity_id), self.gen_ttl)
 
-		for relation_key in relation_keys:
-			pipe.hgetall(relation_key)
+		try:
+			await self._roundtrip(pipe.execute())
+		except CacheUnavailable:
+			# The bump is lost, the whole namespace is bumped once Redis answers again
+			stale_caches.add(self.entity_type)
 
-		return await pipe.execute()
+		self.metrics.invalidations += 1
 
+		if self.local is not None:
+			self.local.pop(entity_id)
+			await self._publish([self.key(entity_id)])
 
-	async def delete(self, entity_id: int) -> None:
-		name = self.key(entity_id)
-		cascade_name = self.cascade_key(entity_id)
-		cascade = await redis.smembers(cascade_name)
 
-		await redis.delete(name, *cascade, cascade_name)
+	async def invalidate_all(self) -> None:
+		try:
+			await self._roundtrip(redis.incr(self.namespace_gen_key()))
+		except CacheUnavailable:
+			stale_caches.add(self.entity_type)
 
-		back_relation = await redis.smembers(self.back_relation_key(entity_id))
+		self.metrics.invalidations += 1
 
-		for i in back_relation:
-			back_name = f"{i}:{self.entity_type.value}"
-			await redis.srem(back_name, cascade_name)
+		if self.local is not None:
+			self.local.clear()
+			await self._publish([f"{self.entity_type.value}:*"])
 
 
-	async def delete_relation(self, entity_id: int, related_type: EntityType, related_id: int) -> None:
-		await redis.srem(self.relation_key(entity_id, related_type), self._key(related_type, related_id))
+	async def _publish(self, keys: list[str]) -> None:
+		try:
+			await cache_breaker.call(publish_invalidation(keys))
+		except CacheUnavailable:
+			# Other workers would keep the entry in L1, resent as a namespace bump later
+			stale_caches.add(self.entity_type)
 
 
-	async def delete_back_relation(self, entity_id: int, related_type: EntityType, related_id: int) -> None:
-		await redis.srem(self.back_relation_key(entity_id), self._key(related_type, related_id))
+	async def stats(self, sample_size: int) -> dict[str, Any]:
+		keys = 0
+		sample: list[str] = []
 
+		async for name in redis.scan_iter(match = f"{self.entity_type.value}:*", count = 1000):
+			keys += 1
 
-topic_cache = RedisEntityCache(EntityType.topic, TopicBase)
-category_cache = RedisEntityCache(EntityType.category, CategoryBase)
-topic_translation_cache = RedisEntityCache(EntityType.topic_translation, TopicTranslationBase)
-translation_cache = RedisEntityCache(EntityType.translation, Translation)
-tag_cache = RedisEntityCache(EntityType.tag, TagBase)
+			if len(sample) < sample_size:
+				sample.append(name)
 
+		pipe = redis.pipeline(transaction = False)
 
-# "topic:1": TopicBase
-# "topic:1:count": 0
-# "category:1": CategoryBase
-# "category:1:count": 0
-# "category:1:cascade": # cascade del
-#	"topic:1"
-#	"topic:2"
-#	 ...
-# "topic:1:topic-translation":
-#	"topic-translation:1"
-#	"topic-translation:2"
-#    ...
-# "topic:1:topic-translation:count": 0
-# "topic-translation:1:back-relation": "topic:1" # del\edit relation
+		for name in sample:
+			pipe.memory_usage(name)
+
+		# MEMORY USAGE may be disabled by ACL, sample what is answered
+		usage = [size for size in await pipe.execute(raise_on_error = False) if isinstance(size, int) and size]
+
+		return {
+			"entity_type": self.entity_type,
+			"keys": keys,
+			"sampled_keys": len(usage),
+			"approx_memory_bytes": int(sum(usage) / len(usage) * keys) if usage else 0,
+		}
+
+
+topic_cache = RedisEntityCache(EntityType.topic, TopicBase, settings.CACHE_TTL_TOPIC)
+category_cache = RedisEntityCache(EntityType.category, CategoryBase, settings.CACHE_TTL_CATEGORY, tracked = True)
+topic_translation_cache = RedisEntityCache(EntityType.topic_translation, TopicTranslationBase,
+	settings.CACHE_TTL_TOPIC_TRANSLATION)
+translation_cache = RedisEntityCache(EntityType.translation, Translation, settings.CACHE_TTL_TRANSLATION,
+	tracked = True)
+tag_cache = RedisEntityCache(EntityType.tag, TagBase, settings.CACHE_TTL_TAG)
+# Only negative entries, media rows are served as ORM objects
+media_cache = RedisEntityCache(EntityType.media, MediaInformation, settings.CACHE_NEGATIVE_TTL)
+
+entity_caches: dict[EntityType, RedisEntityCache] = {
+	cache.entity_type: cache
+	for cache in (topic_cache, category_cache, topic_translation_cache, translation_cache, tag_cache, media_cache)
+}
+
+
+def cache_metrics() -> list[dict[str, Any]]:
+	return [
+		{
+			"entity_type": cache.entity_type,
+			**cache.metrics.snapshot(),
+			"local": cache.local.metrics() if cache.local is not None else None,
+		}
+		for cache in entity_caches.values()
+	]
+
+
+def cache_metrics_text() -> str:
+	snapshots = [({"entity_type": item["entity_type"].value}, item) for item in cache_metrics()]
+	lines: list[str] = []
+
+	for field, help in (
+		("hits", "Reads answered from Redis"),
+		("misses", "Reads that fell through to the database"),
+		("negative_hits", "Reads answered by a cached not-found entry"),
+		("fills", "Values written to Redis"),
+		("invalidations", "Generation bumps"),
+	):
+		lines += prometheus_counter(
+			f"yn_cache_{field}_total", help,
+			[(labels, item[field]) for labels, item in snapshots]
+		)
+
+	lines += prometheus_counter(
+		"yn_cache_local_hits_total", "Reads answered from the in-process L1",
+		[(labels, item["local"]["hits"]) for labels, item in snapshots if item["local"] is not None]
+	)
+	lines += prometheus_histogram(
+		"yn_cache_roundtrip_seconds", "Redis round-trip latency",
+		[(labels, item["latency"]) for labels, item in snapshots]
+	)
+	lines += prometheus_histogram(
+		"yn_cache_payload_bytes", "Size of values read from and written to Redis",
+		[(labels, item["payload_bytes"]) for labels, item in snapshots]
+	)
+
+	breaker = cache_breaker.metrics()
+	lines += prometheus_gauge(
+		"yn_cache_breaker_state", "1 for the current Redis circuit breaker state",
+		[({"state": state.value}, int(breaker["state"] == state)) for state in BreakerState]
+	)
+	lines += prometheus_counter(
+		"yn_cache_breaker_transitions_total", "Circuit breaker state changes",
+		[({"state": state}, count) for state, count in breaker["transitions"].items()]
+	)
+
+	for field, help in (
+		("failures", "Redis calls that failed or timed out"),
+		("timeouts", "Redis calls cut off by CACHE_BREAKER_CALL_TIMEOUT"),
+		("rejected", "Redis calls skipped while the breaker was open"),
+	):
+		lines += prometheus_counter(f"yn_cache_breaker_{field}_total", help, [({}, breaker[field])])
+
+	return "\n".join(lines) + "\n"
+
+
+async def lookup_topic_category(topic_id: int) -> tuple[Optional[CategoryBase], Optional[int], str]:
+	# Also returns the category id and stamp from the cached topic, so a fill
+	# can be stamped before the database is read
+	if {EntityType.topic, EntityType.category} & stale_caches:
+		return None, None, ""
+
+	try:
+		reply = await topic_cache._roundtrip(lookup_topic_category_script(
+			keys = [
+				topic_cache.key(topic_id),
+				topic_cache.namespace_gen_key(),
+				topic_cache.gen_key(topic_id),
+				category_cache.namespace_gen_key(),
+			],
+			args = [f"{EntityType.category.value}:", FORMAT_TAG]
+		))
+	except CacheUnavailable:
+		return None, None, ""
+
+	if not reply:
+		return None, None, ""
+
+	raw, gen, namespace_gen, category_id = reply
+	stamp = category_cache._stamp(namespace_gen, gen)
+	obj = category_cache._decode(raw, stamp)
+	category_cache._count_read(raw, obj is not None)
+
+	return obj, int(category_id), stamp
+
+
+async def flush_stale() -> None:
+	for entity_type in list(stale_caches):
+		stale_caches.discard(entity_type)
+		await entity_caches[entity_type].invalidate_all()
+
+
+def tracked_prefixes() -> list[str]:
+	return [f"{cache.entity_type.value}:" for cache in entity_caches.values() if cache.tracked]
+
+
+def drop_local(keys: list[str]) -> None:
+	for key in keys:
+		entity_type, _, entity_id = key.partition(":")
+		cache = local_caches.get(entity_type)
+
+		if cache is None:
+			continue
+
+		if entity_id == "*":
+			cache.clear()
+		elif entity_id.isdigit():
+			cache.pop(int(entity_id))
+
+
+def clear_local() -> None:
+	for cache in local_caches.values():
+		cache.clear()
+
+
+# Entity types that lost an invalidation while Redis was unreachable
+stale_caches: set[EntityType] = set()
+
+local_caches: dict[str, LocalLRUCache] = {
+	cache.entity_type.value: cache.local
+	for cache in entity_caches.values()
+	if cache.local is not None
+}
+
+
+# Values are "<namespace gen>.<entity gen>|<payload>" and only count as a hit
+# while both counters still match, invalidation is a single INCR
+# "topic:gen": 3                          # bumped to drop every topic at once
+# "topic:1:gen": 7                        # bumped on every write to topic 1
+# "topic:1": "3.7|v1:{...TopicBase}"
+# "topic:1:tag": "3.7|[4, 9]"             # stamped with the owner's counters
+# "tag:4": "0.2|v1:{...TagBase}"          # members are validated on their own
+# "tag:5": "0.1|!"                        # known missing, CACHE_NEGATIVE_TTL
@@ -1,6 +1,7 @@
-from typing import Any, Dict, List, Optional, Protocol, Set, Union, cast
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol, Set, Union, cast
 
 from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
 from redis.typing import AbsExpiryT, EncodableT, ExpiryT, FieldT, KeyT, ResponseT
 
 from ..config import settings
@@ -15,11 +16,26 @@ redis_client.srem
 
 class AsyncRedisPipelineProtocol(Protocol):
     def hgetall(self, name: str) -> dict[Any, Any]: ...
+    def get(self, name: KeyT) -> Any: ...
+    def incr(self, name: KeyT, amount: int = 1) -> Any: ...
+    def delete(self, *names: KeyT) -> Any: ...
+    def hset(self, name: str, key: str | None = None, value: str | None = None, mapping: Dict[Any, Any] | None = None) -> Any: ...
+    def sadd(self, name: KeyT, *values: FieldT) -> Any: ...
+    def set(self, name: KeyT, value: EncodableT, ex: Optional[ExpiryT] = None) -> Any: ...
+    def zremrangebyscore(self, name: KeyT, min: float, max: float) -> Any: ...
+    def zadd(self, name: KeyT, mapping: Dict[Any, float]) -> Any: ...
+    def zcard(self, name: KeyT) -> Any: ...
+    def zrange(self, name: KeyT, start: int, end: int, withscores: bool = False) -> Any: ...
+    def expire(self, name: KeyT, time: ExpiryT) -> Any: ...
+    def memory_usage(self, key: KeyT, samples: Optional[int] = None) -> Any: ...
+    def unlink(self, *names: KeyT) -> Any: ...
     async def execute(self, raise_on_error: bool = True) -> List[Any]: ...
 
 class AsyncRedisProtocol(Protocol):
 	def exists(self, *names: KeyT) -> ResponseT: ...
 
+	async def ping(self) -> bool: ...
+
 	async def hset(
 		self,
 		name: str,
@@ -60,6 +76,8 @@ class AsyncRedisProtocol(Protocol):
 
 	def get(self, name: KeyT) -> ResponseT: ...
 
+	async def mget(self, keys: KeyT, *args: EncodableT) -> List[Any]: ...
+
 	def delete(
 		self,
 		*names: KeyT,
@@ -71,6 +89,10 @@ class AsyncRedisProtocol(Protocol):
 		amount: int = 1,
 	) -> ResponseT: ...
 
+	async def expire(self, name: KeyT, time: ExpiryT) -> bool: ...
+
+	async def ttl(self, name: KeyT) -> int: ...
+
 	async def sadd(self, name: KeyT, *values: FieldT) -> int: ...
 
 	async def srem(self,
@@ -80,6 +102,19 @@ class AsyncRedisProtocol(Protocol):
 
 	async def smembers(self, name: KeyT) -> Set[Any]: ...
 
+	def scan_iter(
+		self,
+		match: Optional[str] = None,
+		count: Optional[int] = None,
+		_type: Optional[str] = None,
+	) -> AsyncIterator[Any]: ...
+
+	async def publish(self, channel: KeyT, message: EncodableT) -> int: ...
+
+	def pubsub(self, **kwargs: Any) -> PubSub: ...
+
+	def register_script(self, script: str) -> Any: ...
+
 	def pipeline(
 		self, transaction: bool = True, shard_hint: Optional[str] = None
 	) -> AsyncRedisPipelineProtocol: ...
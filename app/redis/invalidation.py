@@ -0,0 +1,48 @@
+import asyncio
+import json
+import uuid
+from typing import Callable
+
+from redis.exceptions import RedisError
+
+from ..config import settings
+from .client import redis
+
+WORKER_ID = uuid.uuid4().hex
+
+
+async def publish_invalidation(keys: list[str]) -> None:
+	if not keys:
+		return
+
+	await redis.publish(
+		settings.CACHE_INVALIDATION_CHANNEL,
+		json.dumps({"origin": WORKER_ID, "keys": keys})
+	)
+
+
+async def listen_invalidations(
+	on_invalidate: Callable[[list[str]], None],
+	on_resubscribe: Callable[[], None]
+) -> None:
+	while True:
+		pubsub = redis.pubsub()
+
+		try:
+			await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+			# Pub/sub is at-most-once, anything published while we were away is lost
+			on_resubscribe()
+
+			async for message in pubsub.listen():
+				if message["type"] != "message":
+					continue
+
+				data = json.loads(message["data"])
+
+				if data.get("origin") != WORKER_ID:
+					on_invalidate(data.get("keys", []))
+		except (RedisError, OSError):
+			on_resubscribe()
+			await asyncio.sleep(settings.CACHE_INVALIDATION_RETRY_DELAY)
+		finally:
+			await pubsub.aclose()
@@ -0,0 +1,85 @@
+import logging
+import uuid
+from typing import Optional
+
+from pydantic import ValidationError
+from redis.exceptions import RedisError
+
+from ..config import settings
+from ..schema.users import UserPrincipal
+from .breaker import cache_breaker
+from .client import redis
+
+logger = logging.getLogger(__name__)
+
+
+class PrincipalCache:
+	def __init__(self, ttl: int):
+		self.ttl = ttl
+
+
+	@staticmethod
+	def key(user_id: uuid.UUID) -> str:
+		return f"principal:{user_id}"
+
+
+	@staticmethod
+	def gen_key(user_id: uuid.UUID) -> str:
+		return f"principal:{user_id}:gen"
+
+
+	async def lookup(self, user_id: uuid.UUID) -> tuple[Optional[UserPrincipal], str]:
+		# The stamp is what a fill after a miss must be written with, "" when Redis is unavailable
+		try:
+			raw, gen = await cache_breaker.call(redis.mget(self.key(user_id), self.gen_key(user_id)))
+		except RedisError:
+			return None, ""
+
+		stamp = gen or "0"
+
+		if not isinstance(raw, str):
+			return None, stamp
+
+		value_stamp, _, payload = raw.partition("|")
+
+		if value_stamp != stamp:
+			return None, stamp
+
+		try:
+			return UserPrincipal.model_validate_json(payload), stamp
+		except ValidationError:
+			return None, stamp
+
+
+	async def set(self, user_id: uuid.UUID, principal: UserPrincipal, stamp: str) -> None:
+		if not stamp:
+			return
+
+		pipe = redis.pipeline()
+		pipe.set(self.key(user_id), f"{stamp}|{principal.model_dump_json()}", ex = self.ttl)
+		pipe.expire(self.gen_key(user_id), self.ttl + 1)
+
+		try:
+			await cache_breaker.call(pipe.execute())
+		except RedisError:
+			pass
+
+
+	async def invalidate(self, user_id: uuid.UUID) -> None:
+		# The bump also rejects fills loaded before this write that land after it
+		pipe = redis.pipeline()
+		pipe.incr(self.gen_key(user_id))
+		pipe.expire(self.gen_key(user_id), self.ttl + 1)
+		pipe.delete(self.key(user_id))
+
+		try:
+			await cache_breaker.call(pipe.execute())
+		except RedisError as e:
+			logger.warning("Principal cache invalidation for %s failed, entry expires within %ss: %s", user_id, self.ttl, e)
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_TTL)
+
+
+# "principal:<user uuid>:gen": 2                                 # bumped on every change to the user
+# "principal:<user uuid>": "2|{...UserPrincipal}"                 # expires after PRINCIPAL_CACHE_TTL
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from redis.exceptions import RedisError
+
+from ..config import settings
+from ..db.enums import EntityType
+from .cache import drop_local, entity_caches, local_caches
+from .client import redis
+from .invalidation import publish_invalidation
+
+logger = logging.getLogger(__name__)
+
+purge_tasks: set[asyncio.Task] = set()
+
+
+def job_key(job_id: str) -> str:
+	return f"cache:purge:{job_id}"
+
+
+def resolve_pattern(entity_type: Optional[EntityType], pattern: Optional[str]) -> str:
+	if (entity_type is None) == (pattern is None):
+		raise ValueError("Specify either entity_type or pattern")
+
+	if entity_type is not None:
+		return f"{entity_type.value}:*"
+
+	# Keeps Celery and other keys sharing the database out of reach
+	prefix, separator, _ = pattern.partition(":")
+	if not separator or prefix not in {cache_type.value for cache_type in entity_caches}:
+		raise ValueError(f"Pattern must start with one of: {', '.join(f'{t.value}:' for t in entity_caches)}")
+
+	return pattern
+
+
+async def save_progress(job_id: str, progress: dict[str, Any]) -> None:
+	pipe = redis.pipeline(transaction = False)
+	pipe.hset(job_key(job_id), mapping = progress)
+	pipe.expire(job_key(job_id), settings.CACHE_PURGE_JOB_TTL)
+	await pipe.execute()
+
+
+async def start_purge(entity_type: Optional[EntityType], pattern: Optional[str], dry_run: bool) -> dict[str, Any]:
+	job_id = uuid.uuid4().hex
+	progress: dict[str, Any] = {
+		"pattern": resolve_pattern(entity_type, pattern),
+		"dry_run": int(dry_run),
+		"status": "running",
+		"scanned": 0,
+		"matched": 0,
+		"deleted": 0,
+		"sampled_keys": 0,
+		"approx_memory_bytes": 0,
+		"started_at": datetime.now(timezone.utc).isoformat(),
+	}
+	await save_progress(job_id, progress)
+
+	task = asyncio.create_task(run_purge(job_id, progress, entity_type))
+	purge_tasks.add(task)
+	task.add_done_callback(purge_tasks.discard)
+
+	return {"job_id": job_id, **progress}
+
+
+async def get_purge(job_id: str) -> Optional[dict[str, Any]]:
+	progress = await redis.hgetall(job_key(job_id))
+
+	if not progress:
+		return None
+
+	return {"job_id": job_id, **progress}
+
+
+async def run_purge(job_id: str, progress: dict[str, Any], entity_type: Optional[EntityType]) -> None:
+	sizes: list[int] = []
+	batch: list[str] = []
+
+	try:
+		# Stale entries stop matching at once, UNLINK then only reclaims the memory
+		if entity_type is not None and not progress["dry_run"]:
+			await entity_caches[entity_type].invalidate_all()
+
+		async for name in redis.scan_iter(match = progress["pattern"], count = settings.CACHE_PURGE_BATCH_SIZE):
+			progress["scanned"] += 1
+
+			# Generation counters are kept so in-flight fills with an old stamp stay rejected
+			if name.endswith(":gen"):
+				continue
+
+			batch.append(name)
+
+			if len(batch) >= settings.CACHE_PURGE_BATCH_SIZE:
+				await purge_batch(job_id, progress, batch, sizes)
+				batch = []
+
+		if batch:
+			await purge_batch(job_id, progress, batch, sizes)
+
+		progress["status"] = "finished"
+	except RedisError as e:
+		progress["status"] = "failed"
+		progress["error"] = str(e)
+		logger.error("Cache purge %s of %s failed: %s", job_id, progress["pattern"], e)
+
+	progress["finished_at"] = datetime.now(timezone.utc).isoformat()
+
+	try:
+		await save_progress(job_id, progress)
+	except RedisError as e:
+		logger.error("Cache purge %s finished with status %s, progress not saved: %s", job_id, progress["status"], e)
+
+
+async def purge_batch(job_id: str, progress: dict[str, Any], batch: list[str], sizes: list[int]) -> None:
+	pipe = redis.pipeline(transaction = False)
+
+	for name in batch[:max(settings.CACHE_STATS_SAMPLE_SIZE - len(sizes), 0)]:
+		pipe.memory_usage(name)
+
+	if not progress["dry_run"]:
+		pipe.unlink(*batch)
+
+	results = await pipe.execute(raise_on_error = False)
+
+	if not progress["dry_run"]:
+		*results, deleted = results
+		progress["deleted"] += deleted if isinstance(deleted, int) else 0
+
+		if local_caches:
+			drop_local(batch)
+			await publish_invalidation(batch)
+
+	sizes.extend(size for size in results if isinstance(size, int) and size)
+	progress["matched"] += len(batch)
+	progress["sampled_keys"] = len(sizes)
+	progress["approx_memory_bytes"] = int(sum(sizes) / len(sizes) * progress["matched"]) if sizes else 0
+
+	await save_progress(job_id, progress)
+
+
+# "cache:purge:<job id>": hash with the progress of a purge, expires after CACHE_PURGE_JOB_TTL
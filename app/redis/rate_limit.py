@@ -0,0 +1,81 @@
+import time
+import uuid
+
+from ..config import settings
+from .client import redis
+
+
+class SlidingWindowLimiter:
+	def __init__(self, name: str, limit: int, window: int):
+		self.name = name
+		self.limit = limit
+		self.window = window
+
+
+	def key(self, identity: str) -> str:
+		return f"ratelimit:{self.name}:{identity}"
+
+
+	async def hit(self, identity: str) -> int:
+		now = time.time()
+		key = self.key(identity)
+
+		pipe = redis.pipeline()
+		pipe.zremrangebyscore(key, 0, now - self.window)
+		pipe.zadd(key, {f"{now}:{uuid.uuid4().hex[:8]}": now})
+		pipe.zcard(key)
+		pipe.zrange(key, 0, 0, withscores = True)
+		pipe.expire(key, self.window)
+		_, _, count, oldest, _ = await pipe.execute()
+
+		if count <= self.limit:
+			return 0
+
+		return max(int(oldest[0][1] + self.window - now) + 1, 1)
+
+
+class AccountLockout:
+	def __init__(self, threshold: int, window: int, duration: int):
+		self.threshold = threshold
+		self.window = window
+		self.duration = duration
+
+
+	@staticmethod
+	def failures_key(username: str) -> str:
+		return f"lockout:failures:{username.lower()}"
+
+
+	@staticmethod
+	def locked_key(username: str) -> str:
+		return f"lockout:locked:{username.lower()}"
+
+
+	async def locked_for(self, username: str) -> int:
+		return max(await redis.ttl(self.locked_key(username)), 0)
+
+
+	async def register_failure(self, username: str) -> None:
+		key = self.failures_key(username)
+		failures = await redis.incr(key)
+
+		if failures == 1:
+			await redis.expire(key, self.window)
+
+		if failures >= self.threshold:
+			await redis.set(self.locked_key(username), 1, ex = self.duration)
+			await redis.delete(key)
+
+
+	async def reset(self, username: str) -> None:
+		await redis.delete(self.failures_key(username))
+
+
+login_ip_limiter = SlidingWindowLimiter("login:ip", settings.LOGIN_RATE_LIMIT_PER_IP, settings.LOGIN_RATE_LIMIT_WINDOW)
+login_username_limiter = SlidingWindowLimiter("login:username", settings.LOGIN_RATE_LIMIT_PER_USERNAME, settings.LOGIN_RATE_LIMIT_WINDOW)
+account_lockout = AccountLockout(settings.LOGIN_LOCKOUT_THRESHOLD, settings.LOGIN_LOCKOUT_WINDOW, settings.LOGIN_LOCKOUT_DURATION)
+
+
+# "ratelimit:<name>:<identity>": sorted set of request timestamps inside the window
+# "lockout:failures:<username>": failed attempts counter
+# "lockout:locked:<username>": 1 (expires after LOGIN_LOCKOUT_DURATION)
@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime, timezone
+
+from .client import redis
+
+
+class RevocationRegistry:
+	@staticmethod
+	def key(jti: uuid.UUID | str) -> str:
+		return f"jwt:revoked:{jti}"
+
+
+	@staticmethod
+	def _ttl(expires_at: datetime) -> int:
+		expires_at = expires_at.replace(tzinfo = timezone.utc)
+		return int((expires_at - datetime.now(timezone.utc)).total_seconds())
+
+
+	async def is_revoked(self, jti: uuid.UUID | str) -> bool:
+		return bool(await redis.exists(self.key(jti)))
+
+
+	async def revoke(self, jti: uuid.UUID | str, expires_at: datetime) -> None:
+		ttl = self._ttl(expires_at)
+
+		if ttl > 0:
+			await redis.set(self.key(jti), 1, ex = ttl)
+
+
+	async def revoke_many(self, tokens: list[tuple[uuid.UUID, datetime]]) -> int:
+		pipe = redis.pipeline(transaction = False)
+		count = 0
+
+		for jti, expires_at in tokens:
+			ttl = self._ttl(expires_at)
+
+			if ttl > 0:
+				pipe.set(self.key(jti), 1, ex = ttl)
+				count += 1
+
+		await pipe.execute()
+		return count
+
+
+revocation_registry = RevocationRegistry()
+
+
+# "jwt:revoked:<jti>": 1 (expires together with the refresh token)
@@ -0,0 +1,79 @@
+from .client import redis
+
+# Keys derived inside the scripts (relation members, the topic's category) are not
+# declared in KEYS, which is fine on a single node but not on Redis Cluster.
+
+# Reads like MGET: keys of another type, such as hashes and sets left by the
+# older layout, count as missing and get overwritten by the next fill
+GET_STRING = """
+local function get(key)
+	local value = redis.pcall('GET', key)
+	if type(value) ~= 'string' then
+		return false
+	end
+	return value
+end
+"""
+
+# KEYS: relation, owner namespace gen, owner gen, related namespace gen
+# ARGV: related key prefix, negative entry payload
+# -> relation, owner namespace gen, owner gen, related namespace gen, then value and gen per member
+LOOKUP_RELATIONS = GET_STRING + """
+local result = {}
+for i = 1, 4 do
+	result[i] = get(KEYS[i])
+end
+
+local raw = result[1]
+if not raw then
+	return result
+end
+
+local stamp = (result[2] or '0') .. '.' .. (result[3] or '0') .. '|'
+if string.sub(raw, 1, #stamp) ~= stamp then
+	return result
+end
+
+-- Negative entry: the owner does not exist
+local payload = string.sub(raw, #stamp + 1)
+if payload == ARGV[2] then
+	return result
+end
+
+for _, id in ipairs(cjson.decode(payload)) do
+	local key = ARGV[1] .. string.format('%d', id)
+	table.insert(result, get(key))
+	table.insert(result, get(key .. ':gen'))
+end
+
+return result
+"""
+
+# KEYS: topic, topic namespace gen, topic gen, category namespace gen
+# ARGV: category key prefix, serializer format tag
+# -> category value, category gen, category namespace gen, category id, or nothing when the topic is not cached
+LOOKUP_TOPIC_CATEGORY = GET_STRING + """
+local raw = get(KEYS[1])
+if not raw then
+	return {}
+end
+
+local prefix = (get(KEYS[2]) or '0') .. '.' .. (get(KEYS[3]) or '0') .. '|' .. ARGV[2]
+if string.sub(raw, 1, #prefix) ~= prefix then
+	return {}
+end
+
+local category_id = string.format('%d', cjson.decode(string.sub(raw, #prefix + 1))['category_id'])
+local key = ARGV[1] .. category_id
+
+return {
+	get(key),
+	get(key .. ':gen'),
+	get(KEYS[4]),
+	category_id
+}
+"""
+
+# register_script runs EVALSHA and loads the body only after a NOSCRIPT reply
+lookup_relations_script = redis.register_script(LOOKUP_RELATIONS)
+lookup_topic_category_script = redis.register_script(LOOKUP_TOPIC_CATEGORY)
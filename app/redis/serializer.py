@@ -0,0 +1,33 @@
+from typing import Generic, Optional, Protocol, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+T = TypeVar("T", bound = BaseModel)
+
+# Bump when the stored layout changes, entries with another tag read as misses
+FORMAT_TAG = "v1:"
+
+
+class CacheSerializer(Protocol[T]):
+	def dumps(self, obj: T) -> str: ...
+	def loads(self, raw: Optional[str]) -> Optional[T]: ...
+
+
+class JsonModelSerializer(Generic[T]):
+	def __init__(self, model: Type[T]):
+		self.model = model
+
+
+	def dumps(self, obj: T) -> str:
+		return FORMAT_TAG + obj.model_dump_json()
+
+
+	def loads(self, raw: Optional[str]) -> Optional[T]:
+		if not isinstance(raw, str) or not raw.startswith(FORMAT_TAG):
+			return None
+
+		try:
+			return self.model.model_validate_json(raw[len(FORMAT_TAG):])
+		except ValidationError:
+			return None
+
@@ -0,0 +1,118 @@
+import asyncio
+import uuid
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from ..config import settings
+from .breaker import cache_breaker
+from .client import redis
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+	def __init__(self, lock_ttl: float, wait_timeout: float, poll_interval: float):
+		self.lock_ttl = lock_ttl
+		self.wait_timeout = wait_timeout
+		self.poll_interval = poll_interval
+		self._inflight: dict[str, asyncio.Future[Any]] = {}
+
+
+	@staticmethod
+	def lock_key(key: str) -> str:
+		return f"lock:{key}"
+
+
+	async def do(self,
+		key: str,
+		load: Callable[[], Awaitable[T]],
+		recheck: Optional[Callable[[], Awaitable[Optional[T]]]] = None
+	) -> T:
+		future = self._inflight.get(key)
+
+		if future is not None:
+			try:
+				result = await asyncio.shield(future)
+			except asyncio.CancelledError:
+				# Leader was cancelled (client went away), not us: take over the load
+				if not future.cancelled():
+					raise
+
+				return await self.do(key, load, recheck)
+
+			# Callers mutate returned models before writing them back
+			return result.model_copy() if isinstance(result, BaseModel) else result
+
+		future = asyncio.get_running_loop().create_future()
+		self._inflight[key] = future
+
+		try:
+			result = await self._load(key, load, recheck)
+		except Exception as e:
+			future.set_exception(e)
+			future.exception()
+			raise
+		except BaseException:
+			future.cancel()
+			raise
+		else:
+			future.set_result(result)
+			return result
+		finally:
+			self._inflight.pop(key, None)
+
+
+	async def _load(self,
+		key: str,
+		load: Callable[[], Awaitable[T]],
+		recheck: Optional[Callable[[], Awaitable[Optional[T]]]]
+	) -> T:
+		# Without a shared place to read the result from, other workers cannot wait on us
+		if recheck is None:
+			return await load()
+
+		lock_name = self.lock_key(key)
+		token = uuid.uuid4().hex
+
+		try:
+			acquired = await cache_breaker.call(redis.set(lock_name, token, px = int(self.lock_ttl * 1000), nx = True))
+		except RedisError:
+			return await load()
+
+		if acquired:
+			try:
+				return await load()
+			finally:
+				try:
+					if await cache_breaker.call(redis.get(lock_name)) == token:
+						await cache_breaker.call(redis.delete(lock_name))
+				except RedisError:
+					pass
+
+		loop = asyncio.get_running_loop()
+		deadline = loop.time() + self.wait_timeout
+
+		while loop.time() < deadline:
+			await asyncio.sleep(self.poll_interval)
+
+			try:
+				result = await recheck()
+
+				if result is not None:
+					return result
+
+				if not await cache_breaker.call(redis.exists(lock_name)):
+					break
+			except RedisError:
+				break
+
+		return await load()
+
+
+single_flight = SingleFlight(
+	settings.SINGLE_FLIGHT_LOCK_TTL,
+	settings.SINGLE_FLIGHT_WAIT_TIMEOUT,
+	settings.SINGLE_FLIGHT_POLL_INTERVAL
+)
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from typing import Any, Optional
+
+from redis.exceptions import RedisError, ResponseError
+
+from ..config import settings
+from ..utils.lru import LocalLRUCache
+from .client import redis, redis_client
+
+INVALIDATE_CHANNEL = "__redis__:invalidate"
+
+logger = logging.getLogger(__name__)
+
+
+class ClientSideCache:
+	def __init__(self, max_entries: int, max_value_bytes: int, ttl: int):
+		self.entries: LocalLRUCache[tuple[Optional[str]]] = LocalLRUCache(max_entries, ttl)
+		self.max_value_bytes = max_value_bytes
+		self.active = False
+		self.epoch = 0
+		self.round_trips_saved = 0
+
+
+	def _invalidate(self, message: Any) -> None:
+		if not isinstance(message, list) or message[0] != "message":
+			return
+
+		self.epoch += 1
+		keys = message[2]
+
+		# A null payload means the server flushed its tracking table
+		if keys is None:
+			self.entries.clear()
+			return
+
+		for key in keys:
+			self.entries.pop(key)
+
+
+	async def run(self, prefixes: list[str]) -> None:
+		while True:
+			listener = redis_client.connection_pool.make_connection()
+			tracker = redis_client.connection_pool.make_connection()
+
+			try:
+				await listener.connect()
+				await tracker.connect()
+
+				await listener.send_command("CLIENT", "ID")
+				client_id = await listener.read_response()
+				await listener.send_command("SUBSCRIBE", INVALIDATE_CHANNEL)
+				await listener.read_response()
+
+				# RESP2 redirect mode: the tracker registers the prefixes, the listener gets the pushes
+				await tracker.send_command(
+					"CLIENT", "TRACKING", "ON", "REDIRECT", client_id, "BCAST",
+					*[arg for prefix in prefixes for arg in ("PREFIX", prefix)]
+				)
+				await tracker.read_response()
+				self.active = True
+
+				while True:
+					self._invalidate(await listener.read_response())
+			except ResponseError as e:
+				logger.warning("Client tracking unavailable, using plain reads: %s", e)
+				return
+			except (RedisError, OSError) as e:
+				logger.warning("Client tracking connection lost, reconnecting: %s", e)
+				await asyncio.sleep(settings.CACHE_INVALIDATION_RETRY_DELAY)
+			finally:
+				# Pushes may have been missed, nothing local can be trusted
+				self.active = False
+				self.epoch += 1
+				self.entries.clear()
+				await listener.disconnect()
+				await tracker.disconnect()
+
+
+	async def mget(self, *keys: str) -> list[Optional[str]]:
+		if not self.active:
+			return await redis.mget(*keys)
+
+		cached = [self.entries.get(key) for key in keys]
+		missing = [key for key, entry in zip(keys, cached) if entry is None]
+
+		if not missing:
+			self.round_trips_saved += 1
+			return [entry[0] for entry in cached]
+
+		epoch = self.epoch
+		fetched = dict(zip(missing, await redis.mget(*missing)))
+
+		# An invalidation that arrived during the read may cover what we just got
+		if self.active and epoch == self.epoch:
+			for key, value in fetched.items():
+				if value is None or len(value) <= self.max_value_bytes:
+					self.entries.put(key, (value,))
+
+		return [entry[0] if entry is not None else fetched[key] for key, entry in zip(keys, cached)]
+
+
+	def metrics(self) -> dict[str, Any]:
+		return {
+			"active": self.active,
+			"round_trips_saved": self.round_trips_saved,
+			**self.entries.metrics(),
+		}
+
+
+client_side_cache = ClientSideCache(
+	settings.CACHE_CLIENT_TRACKING_MAX_ENTRIES,
+	settings.CACHE_CLIENT_TRACKING_MAX_VALUE_BYTES,
+	settings.CACHE_CLIENT_TRACKING_TTL
+)
@@ -1,16 +1,26 @@
 import uuid
+from datetime import datetime
 
 from fastapi import Depends, APIRouter, HTTPException, Body, Query
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Annotated
+from typing import Annotated, Optional
 
 from ..utils.security import check_password_strength
 from ..utils.jwt import jwt_auth_check_permission
 from ..db import users as udbfunc, get_session, jwt as jwtdb, tasks as tasks_db
+from ..db.pagination import estimate_count
 from ..config import settings
-from ..schema import users, token, tasks
+from ..schema import users, token, tasks, metrics
 from ..db.enums import UserRoles
+from ..redis.cache import cache_metrics, cache_metrics_text, entity_caches
+from ..redis.breaker import cache_breaker
+from ..redis.principal import principal_cache
+from ..redis.purge import get_purge, start_purge
+from ..redis.tracking import client_side_cache
 from ..tasks import scheduler, celery_send_task
+from ..utils.password_pool import password_pool
+from ..utils.token_cache import access_token_cache
 
 router = APIRouter(prefix="/admin", 
 	dependencies=[
@@ -18,9 +28,27 @@ router = APIRouter(prefix="/admin",
 		]
 )
 
-@router.get("/users", response_model=list[users.UserBase], tags=["Admin User"])
-async def users_list(db: AsyncSession = Depends(get_session)):
-	return await udbfunc.get_users_list(db)
+@router.get("/users", response_model=users.PaginatedUsers, tags=["Admin User"])
+async def users_list(
+	cursor:          Optional[uuid.UUID] = Query(None, description="Last user id of the previous page"),
+	limit:           int = Query(50, ge=1, le=200),
+	role:            Optional[UserRoles] = Query(None),
+	is_disabled:     Optional[bool] = Query(None),
+	username_prefix: Optional[str] = Query(None, min_length=1),
+	estimate_total:  bool = Query(False, description="Include planner row estimate for the filters"),
+	db: AsyncSession = Depends(get_session)
+) -> users.PaginatedUsers:
+	page, next_cursor = await udbfunc.get_users_list(db, cursor, limit, role, is_disabled, username_prefix)
+
+	estimated_total = None
+	if estimate_total:
+		estimated_total = await estimate_count(db, udbfunc.users_list_query(role, is_disabled, username_prefix))
+
+	return users.PaginatedUsers(
+		users           = [users.UserBase.model_validate(user) for user in page],
+		next_cursor     = next_cursor,
+		estimated_total = estimated_total
+	)
 
 
 @router.post("/user/create", tags=["Admin User"])
@@ -77,11 +105,12 @@ async def reset_user_password(user_id: uuid.UUID,
 			detail=f"Password does not meet strength requirements (min length: {settings.PASSWORD_MIN_LENGTH}, policy: {settings.PASSWORD_STRENGTH_POLICY})"
 		)
 	
-	user.password_hash = udbfunc.hash_password(req.password)
+	user.password_hash = await udbfunc.hash_password(req.password)
 	user.force_password_change = user_must_change_password
 
 	db.add(user)
 	await db.commit()
+	await principal_cache.invalidate(user_id)
 	return {"detail": "Password reset successfully"}
 
 
@@ -114,9 +143,29 @@ async def change_user_role(user_id: uuid.UUID, new_role: Annotated[UserRoles, Qu
 	return user
 
 
-@router.get("/jwt", response_model=list[token.JWTUserToken], tags=["Admin JWT"])
-async def jwt_list(db: AsyncSession = Depends(get_session)):
-	return await jwtdb.get_jwt_tokens_list(db)
+@router.get("/jwt", response_model=token.PaginatedJWTTokens, tags=["Admin JWT"])
+async def jwt_list(
+	cursor:         Optional[uuid.UUID] = Query(None, description="Last token id of the previous page"),
+	limit:          int = Query(50, ge=1, le=200),
+	user_id:        Optional[uuid.UUID] = Query(None),
+	is_revoked:     Optional[bool] = Query(None),
+	expires_after:  Optional[datetime] = Query(None),
+	expires_before: Optional[datetime] = Query(None),
+	estimate_total: bool = Query(False, description="Include planner row estimate for the filters"),
+	db: AsyncSession = Depends(get_session)
+) -> token.PaginatedJWTTokens:
+	filters = (user_id, is_revoked, expires_after, expires_before)
+	page, next_cursor = await jwtdb.get_jwt_tokens_list(db, cursor, limit, *filters)
+
+	estimated_total = None
+	if estimate_total:
+		estimated_total = await estimate_count(db, jwtdb.jwt_tokens_list_query(*filters))
+
+	return token.PaginatedJWTTokens(
+		tokens          = [token.JWTUserToken.model_validate(row) for row in page],
+		next_cursor     = next_cursor,
+		estimated_total = estimated_total
+	)
 
 
 @router.post("/jwt/{token_id}/revoke", response_model=dict, tags=["Admin JWT"])
@@ -179,4 +228,57 @@ async def execute_task(task_id: int, db: AsyncSession = Depends(get_session)):
 		raise HTTPException(status_code=404, detail="Task not found")
 	
 	await celery_send_task(task_id, task.task_name)
-	return {"detail": "Task executed successfully"}
\ No newline at end of file
+	return {"detail": "Task executed successfully"}
+
+
+@router.get("/metrics/password_hashing", response_model=metrics.PasswordPoolMetrics, tags=["Admin Metrics"])
+async def password_hashing_metrics():
+	return password_pool.metrics()
+
+
+@router.get("/metrics/access_token_cache", response_model=metrics.TokenCacheMetrics, tags=["Admin Metrics"])
+async def access_token_cache_metrics():
+	return access_token_cache.metrics()
+
+
+@router.get("/metrics/cache", response_model=list[metrics.EntityCacheMetrics], tags=["Admin Metrics"])
+async def entity_cache_metrics():
+	return cache_metrics()
+
+
+@router.get("/metrics/cache/prometheus", response_class=PlainTextResponse, tags=["Admin Metrics"])
+async def entity_cache_metrics_prometheus():
+	return PlainTextResponse(cache_metrics_text(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/metrics/client_tracking", response_model=metrics.ClientTrackingMetrics, tags=["Admin Metrics"])
+async def client_tracking_metrics():
+	return client_side_cache.metrics()
+
+
+@router.get("/metrics/cache_breaker", response_model=metrics.CacheBreakerMetrics, tags=["Admin Metrics"])
+async def cache_breaker_metrics():
+	return cache_breaker.metrics()
+
+
+@router.get("/cache/stats", response_model=list[metrics.CacheStats], tags=["Admin Cache"])
+async def cache_stats():
+	return [await cache.stats(settings.CACHE_STATS_SAMPLE_SIZE) for cache in entity_caches.values()]
+
+
+@router.post("/cache/purge", response_model=metrics.CachePurgeJob, status_code=202, tags=["Admin Cache"])
+async def purge_cache(req: metrics.CachePurgeRequest):
+	try:
+		return await start_purge(req.entity_type, req.pattern, req.dry_run)
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/cache/purge/{job_id}", response_model=metrics.CachePurgeJob, tags=["Admin Cache"])
+async def purge_cache_progress(job_id: str):
+	job = await get_purge(job_id)
+
+	if not job:
+		raise HTTPException(status_code=404, detail="Purge job not found")
+
+	return job
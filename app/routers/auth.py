@@ -14,6 +14,8 @@ from ..utils.security import (
 )
 from ..db import get_session, schema, users as udbfunc, jwt as jwtdb
 from ..db.enums import JWT_Type
+from ..redis.rate_limit import account_lockout
+from ..utils.rate_limit import login_rate_limit
 from .. import config
 from .. import utils
 
@@ -21,12 +23,13 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 security = HTTPBearer()
 
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(login_rate_limit)])
 async def login(request: Request, response: Response, form: OAuth2PasswordRequestForm = Depends(), 
 				db: AsyncSession = Depends(get_session)) -> Token:
 	user = await udbfunc.get_user_by_username(db, form.username)
 
 	if not user:
+		await account_lockout.register_failure(form.username)
 		raise HTTPException(
 			status_code=400, 
 			detail="User not found"
@@ -38,12 +41,19 @@ async def login(request: Request, response: Response, form: OAuth2PasswordReques
 			detail="User is disabled"
 		)
 
-	if not utils.security.verify_password(form.password, user.password_hash):
+	if not await utils.security.verify_password(form.password, user.password_hash):
+		await account_lockout.register_failure(form.username)
 		raise HTTPException(
 			status_code=400, 
 			detail="Incorrect password"
 		)
 	
+	await account_lockout.reset(form.username)
+
+	if utils.security.password_needs_rehash(user.password_hash):
+		user.password_hash = await utils.security.hash_password(form.password)
+		db.add(user)
+
 	if user.force_password_change:
 		raise HTTPException(
 			status_code=403, 
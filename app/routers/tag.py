@@ -41,7 +41,7 @@ async def edit_tag(tag_id: int, req: tag.EditTagRequst, db: AsyncSession = Depen
 	if not tag:
 		raise HTTPException(status_code=404, detail="Tag not found")
 
-	await tag_db.edit_tag(db, tag_id, tag, req)
+	await tag_db.edit_tag(db, tag_id, req)
 
 	return {"detail": "Tag edit successfully"}
 
@@ -59,4 +59,9 @@ async def delete_tag(tag_id: int, db: AsyncSession = Depends(get_session)):
 
 @router.get("/{tag_id}/topics", response_model=list[topics.TopicBase])
 async def list_topics_by_tag(tag_id: int, db: AsyncSession = Depends(get_session)) -> list[topics.TopicBase]:
-	return await tag_db.get_topics_list_by_tag(db, tag_id)
+	tag_topics = await tag_db.get_topics_list_by_tag(db, tag_id)
+
+	if tag_topics is None:
+		raise HTTPException(status_code=404, detail="Tag not found")
+
+	return tag_topics
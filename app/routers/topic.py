@@ -107,7 +107,7 @@ async def change_name(
 	if not topic:
 		raise HTTPException(status_code=404, detail="Topic not found")
 
-	name_hash = await topic_db.change_name(topic_id, topic, req.name, db)
+	name_hash = await topic_db.change_name(topic_id, req.name, db)
 
 	return {"detail": "Topic name changed successfully", "name_hash": name_hash}
 
@@ -129,7 +129,7 @@ async def add_translation(
 	if not translation_code:
 		raise HTTPException(404, "Translation code not found")
 
-	return await topic_db.add_translation(db, topic_id, user_id, translation, translation_code)
+	return await topic_db.add_translation(db, topic_id, user_id, translation)
 
 
 @router.patch("/{topic_id}/translations/{translation_id}")
@@ -145,7 +145,7 @@ async def edit_translation(
 	if not translation:
 		raise HTTPException(404, "Translation not found")
 
-	await topic_db.edit_translation(db, topic_id, translation_id, translation, translation_req, user_id)
+	await topic_db.edit_translation(db, topic_id, translation_id, translation_req, user_id)
 
 	return {
 		"detail": "Translation edited successfully",
@@ -5,9 +5,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
 
 from ..utils.security import check_password_strength, verify_password
-from ..utils.jwt import jwt_extract_user_id, jwt_auth_check_permission
+from ..utils.jwt import Principal, get_principal, jwt_extract_user_id, jwt_auth_check_permission
 from ..db import users as udbfunc, get_session, jwt as jwtdb
 from ..db.enums import UserRoles
+from ..redis.rate_limit import account_lockout
+from ..redis.revocation import revocation_registry
+from ..utils.rate_limit import reset_password_rate_limit
 from ..config import settings
 from ..schema import users
 
@@ -30,8 +33,8 @@ router_public = APIRouter(
 
 
 @router.get("/", response_model=users.UserBase)
-async def get_user(user_id: uuid.UUID = Depends(jwt_extract_user_id), db: AsyncSession = Depends(get_session)):
-	user = await udbfunc.get_user_by_id(db, user_id)
+async def get_user(principal: Principal = Depends(get_principal), db: AsyncSession = Depends(get_session)):
+	user = await principal.get_user(db)
 
 	if not user:
 		raise HTTPException(status_code=404, detail="User not found")
@@ -57,14 +60,14 @@ async def change_username(new_username: str, user_id: uuid.UUID = Depends(jwt_ex
 
 @router.patch("/change_password")
 async def change_password(req: users.UserResetPasswordRequest,
-						  user_id: uuid.UUID = Depends(jwt_extract_user_id),
+						  principal: Principal = Depends(get_principal),
 						  db: AsyncSession = Depends(get_session)):
-	user = await udbfunc.get_user_by_id(db, user_id)
+	user = await principal.get_user(db)
 
 	if not user:
 		raise HTTPException(status_code=404, detail="User not found")
 
-	if not verify_password(req.old_password, user.password_hash):
+	if not await verify_password(req.old_password, user.password_hash):
 		raise HTTPException(status_code=400, detail="Incorrect username or password")
 
 	if not check_password_strength(req.new_password):
@@ -88,6 +91,12 @@ async def get_jwt(user_id: uuid.UUID = Depends(jwt_extract_user_id),
 async def revoke_session(jwt_id: str, 
 						 user_id: uuid.UUID = Depends(jwt_extract_user_id),
 						 db: AsyncSession = Depends(get_session)):
+	if await revocation_registry.is_revoked(jwt_id):
+		raise HTTPException(
+			status_code=400,
+			detail="Session already revoked"
+		)
+
 	token = await jwtdb.get_jwt_token_by_id(db, jwt_id)
 
 	if not token:
@@ -112,18 +121,22 @@ async def revoke_session(jwt_id: str,
 	return {"detail": "Session revoked"}
 
 
-@router_public.patch("/reset_password")
+@router_public.patch("/reset_password", dependencies=[Depends(reset_password_rate_limit)])
 async def reset_password(username: str,
 						 req: users.UserResetPasswordRequest,
 						 db: AsyncSession = Depends(get_session)):
 	user = await udbfunc.get_user_by_username(db, username)
 
 	if not user:
+		await account_lockout.register_failure(username)
 		raise HTTPException(status_code=404, detail="User not found")
 
-	if not verify_password(req.old_password, user.password_hash):
+	if not await verify_password(req.old_password, user.password_hash):
+		await account_lockout.register_failure(username)
 		raise HTTPException(status_code=400, detail="Incorrect username or password")
 
+	await account_lockout.reset(username)
+
 	if not check_password_strength(req.new_password):
 		raise HTTPException(
 			status_code=400, 
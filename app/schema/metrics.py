@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from ..db.enums import EntityType
+
+
+class HistogramSnapshot(BaseModel):
+	buckets: dict[str, int]
+	count:   int
+	sum:     float
+
+
+class PasswordPoolMetrics(BaseModel):
+	workers:     int
+	rounds:      int
+	queue_size:  int
+	in_flight:   int
+	queue_depth: int
+	rejected:    int
+	latency:     HistogramSnapshot
+
+
+class TokenCacheMetrics(BaseModel):
+	size:        int
+	max_entries: int
+	hits:        int
+	misses:      int
+	evictions:   int
+
+
+class ClientTrackingMetrics(TokenCacheMetrics):
+	active:            bool
+	round_trips_saved: int
+
+
+class CacheBreakerMetrics(BaseModel):
+	state:                str
+	consecutive_failures: int
+	failures:             int
+	timeouts:             int
+	rejected:             int
+	transitions:          dict[str, int]
+
+
+class CacheStats(BaseModel):
+	entity_type:         EntityType
+	keys:                int
+	sampled_keys:        int
+	approx_memory_bytes: int
+
+
+class CachePurgeRequest(BaseModel):
+	entity_type: Optional[EntityType] = None
+	pattern:     Optional[str] = Field(None, description="SCAN pattern, must start with an entity type prefix such as \"topic:\"")
+	dry_run:     bool = Field(False, description="Only count matching keys and estimate their memory")
+
+
+class CachePurgeJob(BaseModel):
+	job_id:              str
+	pattern:             str
+	dry_run:             bool
+	status:              str
+	scanned:             int
+	matched:             int
+	deleted:             int
+	sampled_keys:        int
+	approx_memory_bytes: int
+	started_at:          datetime
+	finished_at:         Optional[datetime] = None
+	error:               Optional[str] = None
+
+
+class EntityCacheMetrics(BaseModel):
+	entity_type:   EntityType
+	hits:          int
+	misses:        int
+	hit_ratio:     float
+	negative_hits: int
+	fills:         int
+	invalidations: int
+	latency:       HistogramSnapshot
+	payload_bytes: HistogramSnapshot
+	local:         Optional[TokenCacheMetrics]
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 import uuid
 
 from pydantic import BaseModel
@@ -22,4 +23,10 @@ class JWTUserToken(BaseModel):
 	expires_at     : datetime
 
 	class Config:
-		from_attributes = True
\ No newline at end of file
+		from_attributes = True
+
+
+class PaginatedJWTTokens(BaseModel):
+	tokens: list[JWTUserToken]
+	next_cursor: Optional[uuid.UUID]
+	estimated_total: Optional[int] = None
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 import uuid
 
 from pydantic import BaseModel
@@ -16,6 +17,21 @@ class UserBase(BaseModel):
 		from_attributes = True
 
 
+class PaginatedUsers(BaseModel):
+	users: list[UserBase]
+	next_cursor: Optional[uuid.UUID]
+	estimated_total: Optional[int] = None
+
+
+class UserPrincipal(BaseModel):
+	role: UserRoles
+	is_disabled: bool
+	force_password_change: bool
+
+	class Config:
+		from_attributes = True
+
+
 class ResetPasswordRequest(BaseModel):
 	password: str
 
@@ -1,7 +1,8 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..db import tasks as tasks_db, get_session
+from ..config import settings
+from ..db import tasks as tasks_db, jwt as jwt_db, popularity, get_session
 from .worker import celery
 
 scheduler = AsyncIOScheduler()
@@ -17,6 +18,26 @@ async def celery_send_task(task_id: int, task_name: str):
 		await session.close()
 
 
+async def flush_jwt_last_used():
+	session_generator = get_session()
+	session = await anext(session_generator)
+
+	try:
+		await jwt_db.flush_last_used(session)
+	finally:
+		await session.close()
+
+
+async def flush_topic_popularity():
+	session_generator = get_session()
+	session = await anext(session_generator)
+
+	try:
+		await popularity.flush_topic_hits(session)
+	finally:
+		await session.close()
+
+
 async def schedule_tasks(db: AsyncSession):
 	tasks = await tasks_db.get_tasks(db)
 
@@ -31,4 +52,20 @@ async def schedule_tasks(db: AsyncSession):
 				replace_existing=True,
 			)
 
+	scheduler.add_job(
+		flush_jwt_last_used,
+		"interval",
+		seconds=settings.JWT_LAST_USED_FLUSH_INTERVAL,
+		id="jwt_last_used_flush",
+		replace_existing=True,
+	)
+
+	scheduler.add_job(
+		flush_topic_popularity,
+		"interval",
+		seconds=settings.TOPIC_POPULARITY_FLUSH_INTERVAL,
+		id="topic_popularity_flush",
+		replace_existing=True,
+	)
+
 	scheduler.start()
\ No newline at end of file
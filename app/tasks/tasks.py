@@ -1,7 +1,54 @@
+import asyncio
 from datetime import datetime
+from typing import Any, Awaitable, Callable
 
 from .worker import celery
+from .. import config
+from ..db import engine, get_session, jwt as jwt_db, warmup
+from ..redis.client import redis_client
+
+
+def run_async(fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+	async def runner():
+		session_generator = get_session()
+		session = await anext(session_generator)
+
+		try:
+			return await fn(session, *args)
+		finally:
+			await session.close()
+			await engine.dispose()
+			# Pooled connections are bound to this event loop
+			await redis_client.connection_pool.disconnect()
+
+	return asyncio.run(runner())
+
 
 @celery.task(name="tasks.check")
 def check():
-	print("Task is running at {}".format(datetime.now()))
\ No newline at end of file
+	print("Task is running at {}".format(datetime.now()))
+
+
+async def _prune_jwt_tokens(db) -> dict[str, Any]:
+	dropped = await jwt_db.maintain_jwt_partitions(db, config.settings.JWT_PARTITION_MONTHS_AHEAD)
+	deleted = await jwt_db.prune_jwt_tokens(
+		db,
+		config.settings.JWT_PRUNE_BATCH_SIZE,
+		config.settings.JWT_PRUNE_MAX_BATCHES
+	)
+
+	return {"deleted": deleted, "dropped_partitions": dropped}
+
+
+@celery.task(name="tasks.prune_jwt_tokens")
+def prune_jwt_tokens():
+	return run_async(_prune_jwt_tokens)
+
+
+async def _warm_cache(db) -> dict[str, Any]:
+	return await warmup.warm_topic_cache(db, config.settings.CACHE_WARMUP_TOPICS)
+
+
+@celery.task(name="tasks.warm_cache")
+def warm_cache():
+	return run_async(_warm_cache)
@@ -1,62 +1,96 @@
 import uuid
-from typing import Optional
+from typing import Any, Optional
 
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..db.enums import UserRoles, JWT_Type
-from ..db import get_session
+from ..db import get_session, schema
 from ..db.users import get_user_by_id
+from ..redis.principal import principal_cache
+from ..schema.users import UserPrincipal
 from .security import decode_token
 
 security = HTTPBearer()
 security_no_autoerror = HTTPBearer(auto_error=False)
 
-def jwt_auth_check_permission(allowed_roles: list[UserRoles]):
-	async def wrapper(credentials: HTTPAuthorizationCredentials = Depends(security),
-				      db: AsyncSession = Depends(get_session)):
-		token = credentials.credentials
-		payload = decode_token(token)
 
-		try:
-			user_id = uuid.UUID(payload.get("sub"))
-		except (TypeError, ValueError):
-			raise HTTPException(status_code=401, detail="Invalid token payload")
+class Principal:
+	def __init__(self, user_id: uuid.UUID, payload: dict[str, Any]):
+		self.user_id = user_id
+		self.payload = payload
+		self._user: Optional[schema.User] = None
+		self._user_loaded = False
+
+
+	async def get_user(self, db: AsyncSession) -> Optional[schema.User]:
+		if not self._user_loaded:
+			self._user = await get_user_by_id(db, self.user_id)
+			self._user_loaded = True
 
-		if payload.get("type") == JWT_Type.refresh.value:
-			raise HTTPException(status_code=401, detail="Invalid token type")
+		return self._user
 
-		if not user_id:
-			raise HTTPException(status_code=401, detail="Invalid token payload")
 
-		user = await get_user_by_id(db, user_id)
+	async def get_access(self, db: AsyncSession) -> Optional[UserPrincipal]:
+		access, stamp = await principal_cache.lookup(self.user_id)
+
+		if access is not None:
+			return access
+
+		user = await self.get_user(db)
 
 		if not user:
-			raise HTTPException(status_code=401, detail="Not found")
-		
-		if user.is_disabled:
-			raise HTTPException(status_code=403, detail="User is disabled")
-		
-		if user.role not in allowed_roles:
-			raise HTTPException(status_code=403, detail="Permission denied")
+			return None
 
-	return wrapper
+		access = UserPrincipal.model_validate(user)
+		await principal_cache.set(self.user_id, access, stamp)
 
+		return access
 
-def extract_user_id(token: str):
+
+def resolve_principal(token: str) -> Principal:
 	payload = decode_token(token)
-	user_id = payload.get("sub")
 
-	if not user_id:
+	try:
+		user_id = uuid.UUID(payload.get("sub"))
+	except (TypeError, ValueError):
 		raise HTTPException(status_code=401, detail="Invalid token payload")
 
-	return uuid.UUID(user_id)
+	if payload.get("type") == JWT_Type.refresh.value:
+		raise HTTPException(status_code=401, detail="Invalid token type")
+
+	return Principal(user_id, payload)
+
+
+async def get_principal(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Principal:
+	return resolve_principal(credentials.credentials)
+
+
+async def get_principal_or_none(credentials: HTTPAuthorizationCredentials = Depends(security_no_autoerror)) -> Optional[Principal]:
+	return None if credentials is None else resolve_principal(credentials.credentials)
+
+
+def jwt_auth_check_permission(allowed_roles: list[UserRoles]):
+	async def wrapper(principal: Principal = Depends(get_principal),
+				      db: AsyncSession = Depends(get_session)):
+		access = await principal.get_access(db)
+
+		if access is None:
+			raise HTTPException(status_code=401, detail="Not found")
+		
+		if access.is_disabled:
+			raise HTTPException(status_code=403, detail="User is disabled")
+		
+		if access.role not in allowed_roles:
+			raise HTTPException(status_code=403, detail="Permission denied")
+
+	return wrapper
 
 
-async def jwt_extract_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> uuid.UUID:
-	return extract_user_id(credentials.credentials)
+async def jwt_extract_user_id(principal: Principal = Depends(get_principal)) -> uuid.UUID:
+	return principal.user_id
 	
 
-async def jwt_extract_user_id_or_none(credentials: HTTPAuthorizationCredentials = Depends(security_no_autoerror)) -> Optional[uuid.UUID]:
-	return None if credentials is None else extract_user_id(credentials.credentials)
\ No newline at end of file
+async def jwt_extract_user_id_or_none(principal: Optional[Principal] = Depends(get_principal_or_none)) -> Optional[uuid.UUID]:
+	return None if principal is None else principal.user_id
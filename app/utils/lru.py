@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class LocalLRUCache(Generic[V]):
+	def __init__(self, max_entries: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+		self.max_entries = max_entries
+		self.ttl = ttl
+		self.clock = clock
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.epoch = 0
+		self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+
+
+	def get(self, key: Hashable) -> Optional[V]:
+		entry = self._entries.get(key)
+
+		if entry is None:
+			self.misses += 1
+			return None
+
+		expires_at, value = entry
+
+		if expires_at <= self.clock():
+			del self._entries[key]
+			self.evictions += 1
+			self.misses += 1
+			return None
+
+		self._entries.move_to_end(key)
+		self.hits += 1
+
+		return value
+
+
+	def put(self, key: Hashable, value: V, expires_at: Optional[float] = None) -> None:
+		if self.max_entries <= 0:
+			return
+
+		self._entries[key] = (expires_at if expires_at is not None else self.clock() + self.ttl, value)
+		self._entries.move_to_end(key)
+
+		while len(self._entries) > self.max_entries:
+			self._entries.popitem(last = False)
+			self.evictions += 1
+
+
+	def pop(self, key: Hashable) -> None:
+		self.epoch += 1
+		self._entries.pop(key, None)
+
+
+	def clear(self) -> None:
+		self.epoch += 1
+		self._entries.clear()
+
+
+	def metrics(self) -> dict[str, Any]:
+		return {
+			"size": len(self._entries),
+			"max_entries": self.max_entries,
+			"hits": self.hits,
+			"misses": self.misses,
+			"evictions": self.evictions,
+		}
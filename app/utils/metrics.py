@@ -0,0 +1,74 @@
+from bisect import bisect_left
+from typing import Any
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 65536)
+
+
+class Histogram:
+	def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+		self.buckets = buckets
+		self.counts = [0] * (len(buckets) + 1)
+		self.count = 0
+		self.sum = 0.0
+
+
+	def observe(self, value: float) -> None:
+		self.counts[bisect_left(self.buckets, value)] += 1
+		self.count += 1
+		self.sum += value
+
+
+	def snapshot(self) -> dict[str, Any]:
+		cumulative = 0
+		buckets: dict[str, int] = {}
+
+		for bound, count in zip(self.buckets, self.counts):
+			cumulative += count
+			buckets[str(bound)] = cumulative
+
+		buckets["+Inf"] = self.count
+
+		return {
+			"buckets": buckets,
+			"count": self.count,
+			"sum": self.sum,
+		}
+
+
+def _labels(labels: dict[str, str], **extra: str) -> str:
+	pairs = {**labels, **extra}
+
+	if not pairs:
+		return ""
+
+	return "{" + ",".join(f'{key}="{value}"' for key, value in pairs.items()) + "}"
+
+
+def prometheus_counter(name: str, help: str, samples: list[tuple[dict[str, str], float]]) -> list[str]:
+	lines = [f"# HELP {name} {help}", f"# TYPE {name} counter"]
+	lines += [f"{name}{_labels(labels)} {value}" for labels, value in samples]
+
+	return lines
+
+
+def prometheus_gauge(name: str, help: str, samples: list[tuple[dict[str, str], float]]) -> list[str]:
+	lines = [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+	lines += [f"{name}{_labels(labels)} {value}" for labels, value in samples]
+
+	return lines
+
+
+def prometheus_histogram(name: str, help: str, samples: list[tuple[dict[str, str], dict[str, Any]]]) -> list[str]:
+	lines = [f"# HELP {name} {help}", f"# TYPE {name} histogram"]
+
+	for labels, snapshot in samples:
+		lines += [
+			f"{name}_bucket{_labels(labels, le = bound)} {count}"
+			for bound, count in snapshot["buckets"].items()
+		]
+		lines.append(f"{name}_sum{_labels(labels)} {snapshot['sum']}")
+		lines.append(f"{name}_count{_labels(labels)} {snapshot['count']}")
+
+	return lines
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+import bcrypt
+
+from ..config import settings
+from .metrics import Histogram
+
+
+class PasswordPoolSaturated(Exception):
+	def __init__(self):
+		super().__init__("Password hashing queue is full")
+
+
+def bcrypt_hash(password: str, rounds: int) -> str:
+	pass_utf8 = password.encode('utf-8')[:72]
+	hashed = bcrypt.hashpw(pass_utf8, bcrypt.gensalt(rounds))
+	return hashed.decode('utf-8')
+
+
+def bcrypt_verify(plain_password: str, hashed_password: str) -> bool:
+	pass_utf8 = plain_password.encode('utf-8')[:72]
+	hashed_utf8 = hashed_password.encode('utf-8')
+	return bcrypt.checkpw(pass_utf8, hashed_utf8)
+
+
+def bcrypt_benchmark(rounds: int) -> float:
+	start = time.perf_counter()
+	bcrypt.hashpw(b"calibration-password", bcrypt.gensalt(rounds))
+	return time.perf_counter() - start
+
+
+def bcrypt_rounds(hashed_password: str) -> Optional[int]:
+	try:
+		return int(hashed_password.split("$")[2])
+	except (IndexError, ValueError):
+		return None
+
+
+class PasswordHashPool:
+	def __init__(self, workers: int, queue_size: int, rounds: int = 12):
+		self.workers = workers
+		self.queue_size = queue_size
+		self.rounds = rounds
+		self.pending = 0
+		self.rejected = 0
+		self.latency = Histogram()
+		self._executor: Optional[ProcessPoolExecutor] = None
+
+
+	def _get_executor(self) -> ProcessPoolExecutor:
+		if self._executor is None:
+			self._executor = ProcessPoolExecutor(max_workers = self.workers)
+
+		return self._executor
+
+
+	async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+		if self.pending >= self.workers + self.queue_size:
+			self.rejected += 1
+			raise PasswordPoolSaturated()
+
+		self.pending += 1
+		start = time.perf_counter()
+
+		try:
+			loop = asyncio.get_running_loop()
+			return await loop.run_in_executor(self._get_executor(), fn, *args)
+		finally:
+			self.pending -= 1
+			self.latency.observe(time.perf_counter() - start)
+
+
+	async def calibrate(self, min_rounds: int, max_rounds: int, budget_ms: int) -> int:
+		rounds = min_rounds
+
+		for candidate in range(min_rounds, max_rounds + 1):
+			elapsed = await self.run(bcrypt_benchmark, candidate)
+
+			if elapsed * 1000 > budget_ms:
+				break
+
+			rounds = candidate
+
+		return rounds
+
+
+	def metrics(self) -> dict[str, Any]:
+		return {
+			"workers": self.workers,
+			"rounds": self.rounds,
+			"queue_size": self.queue_size,
+			"in_flight": min(self.pending, self.workers),
+			"queue_depth": max(self.pending - self.workers, 0),
+			"rejected": self.rejected,
+			"latency": self.latency.snapshot(),
+		}
+
+
+	def shutdown(self) -> None:
+		if self._executor is not None:
+			self._executor.shutdown(wait = False, cancel_futures = True)
+			self._executor = None
+
+
+password_pool = PasswordHashPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_SIZE)
@@ -0,0 +1,35 @@
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+
+from ..redis.rate_limit import account_lockout, login_ip_limiter, login_username_limiter
+
+
+async def enforce_login_limits(request: Request, username: str) -> None:
+	retry_after = max(
+		await login_ip_limiter.hit(request.client.host if request.client else "unknown"),
+		await login_username_limiter.hit(username.lower())
+	)
+
+	if retry_after:
+		raise HTTPException(
+			status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+			detail="Too many requests",
+			headers={"Retry-After": str(retry_after)}
+		)
+
+	locked_for = await account_lockout.locked_for(username)
+
+	if locked_for:
+		raise HTTPException(
+			status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+			detail="Account is temporarily locked",
+			headers={"Retry-After": str(locked_for)}
+		)
+
+
+async def login_rate_limit(request: Request, form: OAuth2PasswordRequestForm = Depends()) -> None:
+	await enforce_login_limits(request, form.username)
+
+
+async def reset_password_rate_limit(request: Request, username: str) -> None:
+	await enforce_login_limits(request, username)
@@ -4,7 +4,6 @@ import uuid
 import string
 
 import jwt
-import bcrypt
 import hashlib
 from fastapi import HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials
@@ -14,18 +13,56 @@ from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 from ..db.jwt import check_jwt_token
 from ..db.enums import JWT_Type
 from ..config import settings 
+from ..redis.client import redis
+from .password_pool import PasswordPoolSaturated, bcrypt_hash, bcrypt_rounds, bcrypt_verify, password_pool
+from .token_cache import access_token_cache
 
 
-def hash_password(password: str) -> str:
-	pass_utf8 = password.encode('utf-8')[:72]
-	hashed = bcrypt.hashpw(pass_utf8, bcrypt.gensalt())
-	return hashed.decode('utf-8')
+async def run_in_password_pool(fn, *args):
+	try:
+		return await password_pool.run(fn, *args)
+	except PasswordPoolSaturated:
+		raise HTTPException(
+			status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+			detail="Server is busy, try again later"
+		)
+
+
+async def hash_password(password: str) -> str:
+	return await run_in_password_pool(bcrypt_hash, password, password_pool.rounds)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+	return await run_in_password_pool(bcrypt_verify, plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+	rounds = bcrypt_rounds(hashed_password)
+	# Upgrade only, a hash at or above the target is never rewritten
+	return rounds is not None and rounds < password_pool.rounds
+
 
+async def calibrate_password_hashing() -> int:
+	if settings.BCRYPT_ROUNDS is not None:
+		password_pool.rounds = settings.BCRYPT_ROUNDS
+		return password_pool.rounds
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-	pass_utf8 = plain_password.encode('utf-8')[:72]
-	hashed_utf8 = hashed_password.encode('utf-8')
-	return bcrypt.checkpw(pass_utf8, hashed_utf8)
+	# The first host to calibrate sets the cost for the whole cluster, otherwise
+	# users moving between differently sized hosts would be rehashed back and forth
+	key = "bcrypt:rounds"
+	rounds = await redis.get(key)
+
+	if rounds is None:
+		calibrated = await password_pool.calibrate(
+			settings.BCRYPT_MIN_ROUNDS,
+			settings.BCRYPT_MAX_ROUNDS,
+			settings.BCRYPT_LATENCY_BUDGET_MS
+		)
+		await redis.set(key, calibrated, nx=True, ex=60 * 60 * 24)
+		rounds = await redis.get(key) or calibrated
+
+	password_pool.rounds = int(rounds)
+	return password_pool.rounds
 
 
 def check_password_strength(password: str) -> bool:
@@ -75,26 +112,36 @@ def create_token(data: dict, exp_minutes: int) -> str:
 
 
 def decode_token(token: str) -> Dict[str, Any]:
+	payload = access_token_cache.get(token)
+
+	if payload is not None:
+		return payload
+
 	try:
-		return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+		payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
 	except ExpiredSignatureError:
 		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
 	except InvalidTokenError:
 		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
+	if payload.get("type") == JWT_Type.access.value:
+		access_token_cache.put(token, payload)
+
+	return payload
+
 
 async def validate_refresh_token(token: str, db: AsyncSession) -> Dict[str, Any]:
 	payload = decode_token(token)
 
-	if not await check_jwt_token(db, token):
-			raise HTTPException(status_code=401, detail="Token is revoked or invalid")
-
 	if payload.get("type") != JWT_Type.refresh.value:
 		raise HTTPException(
 			status_code=status.HTTP_401_UNAUTHORIZED,
 			detail="Invalid token type"
 		)
 
+	if not await check_jwt_token(db, payload.get("jti"), token):
+		raise HTTPException(status_code=401, detail="Token is revoked or invalid")
+
 	return payload
 
 def hash_topic_name(name: str) -> str:
@@ -0,0 +1,29 @@
+import time
+from typing import Any, Optional
+
+from ..config import settings
+from .lru import LocalLRUCache
+
+
+class DecodedTokenCache(LocalLRUCache[dict[str, Any]]):
+	def __init__(self, max_entries: int):
+		# Entries live until the token's own exp claim, on the wall clock it is expressed in
+		super().__init__(max_entries, 0, clock = time.time)
+
+
+	def get(self, token: str) -> Optional[dict[str, Any]]:
+		payload = super().get(token)
+
+		return dict(payload) if payload is not None else None
+
+
+	def put(self, token: str, payload: dict[str, Any]) -> None:
+		exp = payload.get("exp")
+
+		if not isinstance(exp, (int, float)):
+			return
+
+		super().put(token, dict(payload), expires_at = exp)
+
+
+access_token_cache = DecodedTokenCache(settings.ACCESS_TOKEN_CACHE_SIZE)
@@ -0,0 +1,61 @@
+"""Compare the legacy per-field hash layout with the single-blob serializer.
+
+Run from the repository root with the application environment loaded:
+
+	python -m benchmarks.cache_serialization [iterations]
+"""
+import sys
+import timeit
+import uuid
+from datetime import datetime, timezone
+
+from app.redis.serializer import JsonModelSerializer
+from app.schema.topics import TopicBase
+
+
+def legacy_dumps(obj: TopicBase) -> dict:
+	return {
+		key: "null" if value is None else value
+		for key, value in obj.model_dump(mode="json").items()
+	}
+
+
+def legacy_loads(raw: dict) -> TopicBase:
+	return TopicBase.model_validate({
+		key: None if value == "null" else value
+		for key, value in raw.items()
+	})
+
+
+def main(iterations: int) -> None:
+	topic = TopicBase(
+		id = 1,
+		name = "Yoshino Niku",
+		created_at = datetime.now(timezone.utc),
+		edited_at = datetime.now(timezone.utc),
+		creator_user_id = uuid.uuid4(),
+		cover_image_id = None,
+		category_id = 1,
+	)
+	serializer = JsonModelSerializer(TopicBase)
+	# HGETALL hands back every field as str
+	legacy_raw = {key: str(value) for key, value in legacy_dumps(topic).items()}
+	blob = serializer.dumps(topic)
+
+	cases = {
+		"hash encode": lambda: legacy_dumps(topic),
+		"hash decode": lambda: legacy_loads(legacy_raw),
+		"blob encode": lambda: serializer.dumps(topic),
+		"blob decode": lambda: serializer.loads(blob),
+	}
+
+	for name, fn in cases.items():
+		elapsed = timeit.timeit(fn, number = iterations)
+		print(f"{name:<12} {elapsed / iterations * 1e6:8.2f} us/op")
+
+	print(f"{'hash size':<12} {sum(len(k) + len(v) for k, v in legacy_raw.items()):8d} bytes")
+	print(f"{'blob size':<12} {len(blob):8d} bytes")
+
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
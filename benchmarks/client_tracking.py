@@ -0,0 +1,91 @@
+"""Count Redis round trips on hot translation code and topic category reads
+with and without client tracking.
+
+Needs a reachable Redis 6+ from the application environment:
+
+	python -m benchmarks.client_tracking [iterations]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timezone
+
+from app.db import topic as topic_db, translation_code as tc_db
+from app.redis import cache
+from app.redis.client import redis_client
+from app.redis.tracking import client_side_cache
+from app.schema.category import CategoryBase
+from app.schema.topics import TopicBase
+from app.schema.translation_code import Translation
+
+round_trips = 0
+
+
+async def seed() -> None:
+	now = datetime.now(timezone.utc)
+	topic = TopicBase(id = 1, name = "bench", created_at = now, edited_at = now,
+		creator_user_id = None, cover_image_id = None, category_id = 1)
+	category = CategoryBase(id = 1, name = "bench", description = "bench")
+	translation = Translation(id = 1, translation_code = "en", full_name = "English")
+
+	for item_cache, obj in (
+		(cache.topic_cache, topic),
+		(cache.category_cache, category),
+		(cache.translation_cache, translation),
+	):
+		lookup = await item_cache.lookup(obj.id)
+		await item_cache.set(obj.id, obj, lookup.stamp)
+
+
+async def measure(label: str, iterations: int) -> None:
+	global round_trips
+
+	# Both reads are served from cache, the session is never touched
+	for name, read in (
+		("get_translation_code_by_id", lambda: tc_db.get_translation_code_by_id(1, None)),
+		("get_topic_category", lambda: topic_db.get_topic_category(1, None)),
+	):
+		await read()
+		round_trips = 0
+		started = time.perf_counter()
+
+		for _ in range(iterations):
+			await read()
+
+		elapsed = time.perf_counter() - started
+		print(f"{label:<9} {name:<27} {round_trips / iterations:5.2f} round trips/op {elapsed / iterations * 1e6:9.1f} us/op")
+
+
+async def main(iterations: int) -> None:
+	global round_trips
+	execute_command = redis_client.execute_command
+
+	async def counting(*args, **kwargs):
+		global round_trips
+		round_trips += 1
+		return await execute_command(*args, **kwargs)
+
+	redis_client.execute_command = counting
+	await seed()
+
+	for item_cache in (cache.category_cache, cache.translation_cache):
+		item_cache.tracked = False
+
+	await measure("plain", iterations)
+
+	for item_cache in (cache.category_cache, cache.translation_cache):
+		item_cache.tracked = True
+
+	listener = asyncio.create_task(client_side_cache.run(cache.tracked_prefixes()))
+	await asyncio.sleep(0.1)
+
+	if not client_side_cache.active:
+		print("client tracking is not available on this server")
+	else:
+		await measure("tracking", iterations)
+
+	listener.cancel()
+
+
+if __name__ == "__main__":
+	asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000))